@@ -29,3 +29,10 @@ def get_fred_api_key():
     config = configparser.ConfigParser()
     config.read("config.ini")
     return config["FRED"]["api_key"]
+
+
+def get_polygon_requests_per_minute():
+    config = configparser.ConfigParser()
+    config.read("./config/config.ini")
+    # Free plan budget; raise it in config.ini for paid plans
+    return config.getint("polygon", "requests_per_minute", fallback=5)
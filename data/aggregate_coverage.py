@@ -0,0 +1,151 @@
+# data/aggregate_coverage.py
+
+from datetime import datetime
+import threading
+import numpy as np
+import pytz
+from data.trading_calendar import session_runs, trading_sessions
+
+EASTERN = pytz.timezone("America/New_York")
+
+
+def _to_datetime(day):
+    return datetime.combine(day.item(), datetime.min.time())
+
+
+class CoverageIndex:
+    """
+    Which trading sessions are fully cached, per (ticker, multiplier, timespan).
+
+    Coverage is kept as sorted, disjoint intervals of session dates, mirrored
+    in the aggregate_coverage table and loaded lazily per key. Intervals that
+    only have weekends or holidays between them are merged, so a range is
+    judged complete against the trading calendar rather than calendar days.
+    """
+
+    def __init__(self):
+        self._intervals = {}
+        self._lock = threading.Lock()
+
+    def _load(self, session, key):
+        if key not in self._intervals:
+            from models.models import AggregateCoverage
+
+            ticker, multiplier, timespan = key
+            rows = (
+                session.query(AggregateCoverage.start, AggregateCoverage.end)
+                .filter(
+                    AggregateCoverage.ticker == ticker,
+                    AggregateCoverage.multiplier == multiplier,
+                    AggregateCoverage.timespan == timespan,
+                )
+                .all()
+            )
+            intervals = [
+                (np.datetime64(start, "D"), np.datetime64(end, "D"))
+                for start, end in rows
+            ]
+            with self._lock:
+                self._intervals.setdefault(key, self._merge(intervals))
+        return self._intervals[key]
+
+    @staticmethod
+    def _merge(intervals):
+        """
+        Sort and merge intervals that overlap or touch in session terms.
+        """
+        if not intervals:
+            return []
+        intervals = sorted(intervals)
+        first, last = intervals[0][0], intervals[-1][1]
+        sessions = trading_sessions(first, last)
+        covered = np.zeros(len(sessions), dtype=bool)
+        for start, end in intervals:
+            covered[(sessions >= start) & (sessions <= end)] = True
+        return session_runs(sessions[covered])
+
+    def _covered(self, session, key, sessions):
+        intervals = self._load(session, key)
+        if not intervals:
+            return np.zeros(len(sessions), dtype=bool)
+        starts = np.array([start for start, _ in intervals])
+        ends = np.array([end for _, end in intervals])
+        position = np.searchsorted(starts, sessions, side="right") - 1
+        return (position >= 0) & (sessions <= ends[np.maximum(position, 0)])
+
+    def missing(self, session, key, start_date, end_date):
+        """
+        Trading-session sub-ranges of [start_date, end_date] not yet cached.
+
+        :param session: SQLAlchemy session used to load the key's coverage.
+        :return: List of (first, last) datetime64[D] session pairs.
+        """
+        sessions = trading_sessions(start_date, end_date)
+        return session_runs(sessions[~self._covered(session, key, sessions)])
+
+    def runs(self, session, key, start_date, end_date):
+        """
+        [start_date, end_date] split into alternating cached and missing
+        session runs, in date order.
+
+        :return: List of (first, last, covered) tuples.
+        """
+        sessions = trading_sessions(start_date, end_date)
+        covered = self._covered(session, key, sessions)
+        if len(sessions) == 0:
+            return []
+        breaks = np.flatnonzero(covered[1:] != covered[:-1]) + 1
+        starts = np.r_[0, breaks]
+        stops = np.r_[breaks - 1, len(sessions) - 1]
+        return [
+            (sessions[start], sessions[stop], bool(covered[start]))
+            for start, stop in zip(starts, stops)
+        ]
+
+    def mark(self, session, key, first, last, now=None):
+        """
+        Record sessions [first, last] as fully cached. Sessions that have not
+        closed yet (today's, in New York time) are left uncovered so they are
+        fetched again later.
+
+        :return: Whether anything was recorded.
+        """
+        from models.models import AggregateCoverage
+
+        now = now or datetime.now(EASTERN)
+        last = min(np.datetime64(last, "D"), np.datetime64(now.date(), "D") - 1)
+        first = np.datetime64(first, "D")
+        if last < first:
+            return False
+
+        current = self._load(session, key)
+        with self._lock:
+            intervals = self._merge(current + [(first, last)])
+            self._intervals[key] = intervals
+        ticker, multiplier, timespan = key
+        session.query(AggregateCoverage).filter(
+            AggregateCoverage.ticker == ticker,
+            AggregateCoverage.multiplier == multiplier,
+            AggregateCoverage.timespan == timespan,
+        ).delete(synchronize_session=False)
+        session.add_all(
+            AggregateCoverage(
+                ticker=ticker,
+                multiplier=multiplier,
+                timespan=timespan,
+                start=_to_datetime(start),
+                end=_to_datetime(end),
+            )
+            for start, end in intervals
+        )
+        return True
+
+    def invalidate(self, key=None):
+        """
+        Drop in-memory coverage so it is reloaded from the table.
+        """
+        with self._lock:
+            if key is None:
+                self._intervals.clear()
+            else:
+                self._intervals.pop(key, None)
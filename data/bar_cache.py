@@ -0,0 +1,250 @@
+# data/bar_cache.py
+
+from datetime import datetime, timedelta
+import numpy as np
+import pytz
+from data.aggregate_coverage import EASTERN
+
+BAR_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Resolution each timespan is resampled from; only these are fetched
+BASE_RESOLUTIONS = {
+    "minute": (1, "minute"),
+    "hour": (1, "minute"),
+    "day": (1, "day"),
+    "week": (1, "day"),
+    "month": (1, "day"),
+    "quarter": (1, "day"),
+    "year": (1, "day"),
+}
+
+_MS_PER_DAY = 86_400_000
+_MS_PER_HOUR = 3_600_000
+_INTRADAY_MS = {"minute": 60_000, "hour": 3_600_000}
+_MONTHS = {"month": 1, "quarter": 3, "year": 12}
+# 1970-01-05, the first Monday after the epoch
+_FIRST_MONDAY = 4
+
+
+def rows_to_columns(rows):
+    """
+    AggregateData rows to a dict of arrays keyed by BAR_COLUMNS, with
+    timestamps in epoch milliseconds (UTC).
+    """
+    dates = [
+        row.date if row.date.tzinfo else row.date.replace(tzinfo=pytz.UTC)
+        for row in rows
+    ]
+    return {
+        "timestamp": np.array(
+            [round(d.timestamp() * 1000) for d in dates], dtype=np.int64
+        ),
+        "open": np.array([row.open for row in rows], dtype=float),
+        "high": np.array([row.high for row in rows], dtype=float),
+        "low": np.array([row.low for row in rows], dtype=float),
+        "close": np.array([row.close for row in rows], dtype=float),
+        "volume": np.array([row.volume for row in rows], dtype=float),
+    }
+
+
+def _new_york_offsets(timestamps):
+    """
+    New York UTC offset in ms at each epoch-ms timestamp. DST changes fall on
+    whole UTC hours, so the offset is looked up once per distinct hour.
+    """
+    hours, inverse = np.unique(timestamps // _MS_PER_HOUR, return_inverse=True)
+    offsets = np.array(
+        [
+            datetime.fromtimestamp(hour * 3600, tz=pytz.UTC)
+            .astimezone(EASTERN)
+            .utcoffset()
+            // timedelta(milliseconds=1)
+            for hour in hours.tolist()
+        ],
+        dtype=np.int64,
+    )
+    return offsets[inverse.reshape(timestamps.shape)]
+
+
+def _session_start_ms(day):
+    """
+    Midnight New York time of a day (days since the epoch), in epoch ms.
+    """
+    midnight = datetime.combine(
+        np.datetime64(int(day), "D").item(), datetime.min.time()
+    )
+    return round(EASTERN.localize(midnight).timestamp() * 1000)
+
+
+def _bucket_start_days(days, multiplier, timespan):
+    """
+    First calendar day of the bucket each day (days since the epoch) is in.
+    """
+    if timespan == "day":
+        return days // multiplier * multiplier
+    if timespan == "week":
+        width = 7 * multiplier
+        return (days - _FIRST_MONDAY) // width * width + _FIRST_MONDAY
+    step = _MONTHS[timespan] * multiplier
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    starts = (months // step * step).astype("datetime64[M]")
+    return starts.astype("datetime64[D]").astype(np.int64)
+
+
+def _bucket_end_day(start_day, multiplier, timespan):
+    """
+    Last calendar day of the bucket beginning on start_day.
+    """
+    start_day = int(start_day)
+    if timespan == "day":
+        return start_day + multiplier - 1
+    if timespan == "week":
+        return start_day + 7 * multiplier - 1
+    month = np.datetime64(start_day, "D").astype("datetime64[M]")
+    next_start = (month + _MONTHS[timespan] * multiplier).astype("datetime64[D]")
+    return int(next_start.astype(np.int64)) - 1
+
+
+def bucket_starts(timestamps, multiplier, timespan):
+    """
+    Bucket start (epoch ms) for each bar timestamp.
+
+    Intraday buckets are aligned to New York wall-clock time, so e.g. 4-hour
+    buckets start at midnight, 04:00, 08:00, ... Eastern in both winter and
+    summer. Day-based buckets use the bar's UTC date, which is the session
+    date for Polygon daily bars (stamped at midnight New York time); weeks
+    start on Monday and months, quarters and years on calendar boundaries.
+    """
+    if timespan in _INTRADAY_MS:
+        width = _INTRADAY_MS[timespan] * multiplier
+        if _MS_PER_HOUR % width == 0:
+            # New York is a whole number of hours from UTC, so epoch
+            # alignment already matches its wall clock
+            return timestamps // width * width
+        local = timestamps + _new_york_offsets(timestamps)
+        local_starts = local // width * width
+        # Convert back with the offset in force at the bucket start, which
+        # differs from the bar's own on a DST change
+        offsets = _new_york_offsets(local_starts - (local - timestamps))
+        return local_starts - offsets
+    days = timestamps // _MS_PER_DAY
+    return _bucket_start_days(days, multiplier, timespan) * _MS_PER_DAY
+
+
+def resample(bars, multiplier, timespan):
+    """
+    Vectorized OHLCV resampling of time-ordered bars to a coarser resolution.
+
+    :param bars: Dict of arrays keyed by BAR_COLUMNS.
+    :return: Dict of arrays keyed by BAR_COLUMNS, one row per non-empty
+        bucket, stamped with the bucket start.
+    """
+    timestamps = bars["timestamp"]
+    if len(timestamps) == 0:
+        return {name: bars[name][:0] for name in BAR_COLUMNS}
+    starts = bucket_starts(timestamps, multiplier, timespan)
+    first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    last = np.r_[first[1:] - 1, len(timestamps) - 1]
+    return {
+        "timestamp": starts[first],
+        "open": bars["open"][first],
+        "high": np.maximum.reduceat(bars["high"], first),
+        "low": np.minimum.reduceat(bars["low"], first),
+        "close": bars["close"][last],
+        "volume": np.add.reduceat(bars["volume"], first),
+    }
+
+
+class BarCache:
+    """
+    Bars for any resolution, keyed by (ticker, multiplier, timespan).
+
+    Only the base resolutions in BASE_RESOLUTIONS are fetched, through the
+    client's gap-aware fetch_aggregates. Coarser series (5 minute, 1 hour,
+    1 week, ...) are resampled locally from the cached base bars and kept in
+    memory together with the base data version they were built from; when
+    the client stores new base bars for the ticker the derived series is
+    rebuilt on next access.
+    """
+
+    def __init__(self, client):
+        """
+        :param client: data.polygon_client.PolygonClient.
+        """
+        self.client = client
+        self._derived = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_bars(self, ticker, multiplier, timespan, start_date, end_date):
+        """
+        Bars for [start_date, end_date] ("YYYY-MM-DD", inclusive).
+
+        :return: Dict of arrays keyed by BAR_COLUMNS (timestamps in epoch ms).
+        """
+        base = BASE_RESOLUTIONS[timespan]
+        if (multiplier, timespan) == base:
+            return rows_to_columns(
+                self.client.fetch_aggregates(ticker, *base, start_date, end_date)
+            )
+
+        first_day = int(np.datetime64(start_date, "D").astype(np.int64))
+        last_day = int(np.datetime64(end_date, "D").astype(np.int64))
+        if timespan not in _INTRADAY_MS:
+            # Widen to whole buckets so edge bars are not built from part of
+            # their base bars
+            first_day, last_bucket = _bucket_start_days(
+                np.array([first_day, last_day]), multiplier, timespan
+            ).tolist()
+            last_day = _bucket_end_day(last_bucket, multiplier, timespan)
+
+        key = (ticker, multiplier, timespan)
+        version = self.client.data_versions.get((ticker, *base), 0)
+        entry = self._derived.get(key)
+        if (
+            entry is None
+            or entry["version"] != version
+            or first_day < entry["first_day"]
+            or last_day > entry["last_day"]
+        ):
+            self.misses += 1
+            span = (first_day, last_day)
+            if entry is not None and entry["version"] == version:
+                # Grow the cached span rather than rebuilding a disjoint one
+                span = (
+                    min(first_day, entry["first_day"]),
+                    max(last_day, entry["last_day"]),
+                )
+            rows = self.client.fetch_aggregates(
+                ticker, *base, *(str(np.datetime64(day, "D")) for day in span)
+            )
+            entry = {
+                # Fetching may itself have stored new base bars
+                "version": self.client.data_versions.get((ticker, *base), 0),
+                "first_day": span[0],
+                "last_day": span[1],
+                "bars": resample(rows_to_columns(rows), multiplier, timespan),
+            }
+            self._derived[key] = entry
+        else:
+            self.hits += 1
+
+        timestamps = entry["bars"]["timestamp"]
+        if timespan in _INTRADAY_MS:
+            # Sessions are New York dates, as in the client's own queries
+            bounds = (_session_start_ms(first_day), _session_start_ms(last_day + 1))
+        else:
+            # Day-based buckets are stamped at UTC midnight of their first day
+            bounds = (first_day * _MS_PER_DAY, (last_day + 1) * _MS_PER_DAY)
+        lo, hi = np.searchsorted(timestamps, bounds, side="left").tolist()
+        return {name: entry["bars"][name][lo:hi] for name in BAR_COLUMNS}
+
+    def invalidate(self, ticker=None):
+        """
+        Drop derived series for one ticker, or all of them.
+        """
+        if ticker is None:
+            self._derived.clear()
+            return
+        for key in [key for key in self._derived if key[0] == ticker]:
+            del self._derived[key]
@@ -12,12 +12,12 @@ Base = declarative_base()
 
 def initialize_database(engine):
     """
-    Initialize the database by creating all tables.
+    Initialize the database by creating all tables and applying column
+    migrations to existing ones.
 
     :param engine: SQLAlchemy engine instance.
     """
-    from models.models import AggregateData, OptionData
+    from data.migrations import migrate
 
-    # Import all your models here
-    Base.metadata.create_all(bind=engine)
+    migrate(engine)
     logging.info("Database tables created successfully.")
@@ -0,0 +1,48 @@
+# data/migrations.py
+
+import logging
+from sqlalchemy import inspect, text
+
+# Columns added to tables that may already exist; create_all never alters an
+# existing table. (table, column, SQL type)
+ADDED_COLUMNS = (
+    ("aggregate_data", "multiplier", "INTEGER"),
+    ("aggregate_data", "timespan", "VARCHAR"),
+    ("option_data", "price", "DOUBLE PRECISION"),
+    ("option_data", "iv", "DOUBLE PRECISION"),
+)
+
+
+def migrate(engine):
+    """
+    Bring an existing database up to the current models. Safe to run on
+    every start.
+
+    Missing tables (e.g. aggregate_coverage, positions) are created and the
+    columns in ADDED_COLUMNS are added where absent. Added columns are left
+    NULL on existing rows: aggregate bars stored without a resolution never
+    match a query and are refetched on demand, and option snapshots without
+    a price or IV attribute to NaN.
+
+    :param engine: SQLAlchemy engine instance.
+    :return: List of (table, column) pairs that were added.
+    """
+    from models.models import Base
+
+    Base.metadata.create_all(bind=engine)
+    inspector = inspect(engine)
+    existing = {}
+    added = []
+    with engine.begin() as connection:
+        for table, column, sql_type in ADDED_COLUMNS:
+            if table not in existing:
+                existing[table] = {c["name"] for c in inspector.get_columns(table)}
+            if column in existing[table]:
+                continue
+            connection.execute(
+                text(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}")
+            )
+            existing[table].add(column)
+            added.append((table, column))
+            logging.info(f"Added column {table}.{column} ({sql_type}).")
+    return added
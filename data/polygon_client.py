@@ -1,64 +1,399 @@
-from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import logging
+import threading
 import pytz
-from config.db_manager import get_engine
 from polygon import RESTClient
+from sqlalchemy import insert
 from models.models import AggregateData, OptionData, session_scope
+import numpy as np
 import yfinance as yf
-from services.black_scholes_service import calculate_greeks
+from services.black_scholes_service import calculate_greeks, implied_volatility_batch
+from data.yield_curve import YieldCurveProvider
+from data.aggregate_coverage import EASTERN, CoverageIndex
+from data.bar_cache import BAR_COLUMNS, rows_to_columns
+from data.rate_limiter import TokenBucket
+from data.single_flight import SingleFlight
 
-engine = get_engine()
-Session = sessionmaker(bind=engine)
-session = Session()
+# Largest page Polygon serves, so most ranges cost a single request
+AGGS_PAGE_LIMIT = 50000
+# Bars per inserted/yielded batch when ingesting
+DEFAULT_BATCH_ROWS = 50_000
+
+
+def _bar_columns(rows):
+    """
+    (timestamp, open, high, low, close, volume) tuples to a dict of arrays
+    keyed by BAR_COLUMNS.
+    """
+    timestamp, open_, high, low, close, volume = zip(*rows)
+    return {
+        "timestamp": np.array(timestamp, dtype=np.int64),
+        "open": np.array(open_, dtype=float),
+        "high": np.array(high, dtype=float),
+        "low": np.array(low, dtype=float),
+        "close": np.array(close, dtype=float),
+        "volume": np.array(volume, dtype=float),
+    }
+
+
+def _insert_batch(session, key, batch):
+    """
+    Bulk insert a columnar batch as plain rows, without ORM objects.
+    """
+    ticker, multiplier, timespan = key
+    session.execute(
+        insert(AggregateData),
+        [
+            {
+                "ticker": ticker,
+                "multiplier": multiplier,
+                "timespan": timespan,
+                "date": datetime.fromtimestamp(timestamp / 1000, tz=pytz.UTC),
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+            }
+            for timestamp, open_, high, low, close, volume in zip(
+                *(batch[name].tolist() for name in BAR_COLUMNS)
+            )
+        ],
+    )
+
+
+def _session_start(day, days=0):
+    """
+    Midnight New York time of a "YYYY-MM-DD" string or datetime64 day, plus
+    days. Sessions are New York dates, so extended-hours bars stamped after
+    midnight UTC still fall inside their own session's bounds.
+    """
+    midnight = datetime.strptime(str(day), "%Y-%m-%d") + timedelta(days=days)
+    return EASTERN.localize(midnight)
+
+
+class _RateLimitedRESTClient(RESTClient):
+    """
+    RESTClient that takes a token before every HTTP request, including each
+    further page list_aggs follows through next_url.
+    """
+
+    def __init__(self, api_key, rate_limiter, **kwargs):
+        super().__init__(api_key, **kwargs)
+        self.rate_limiter = rate_limiter
+
+    def _get(self, *args, **kwargs):
+        self.rate_limiter.acquire()
+        return super()._get(*args, **kwargs)
 
 
 class PolygonClient:
-    def __init__(self, api_key):
-        self.client = RESTClient(api_key)
+    def __init__(
+        self,
+        api_key,
+        greeks_cache=None,
+        yield_curve=None,
+        rate_limiter=None,
+        base_url=None,
+    ):
+        # Shared by every thread issuing Polygon requests through this client
+        if rate_limiter is None:
+            from config.config_manager import get_polygon_requests_per_minute
+
+            rate_limiter = TokenBucket.per_minute(get_polygon_requests_per_minute())
+        self.rate_limiter = rate_limiter
+        # base_url lets a local fake REST server stand in for Polygon
+        self.client = _RateLimitedRESTClient(
+            api_key, rate_limiter, **({"base": base_url} if base_url else {})
+        )
+        # Treasury curve loaded once per day; replaces the old flat r = 0.01
+        self.yield_curve = yield_curve or YieldCurveProvider()
+        # Optional services.greeks_cache.GreeksCache used instead of calculate_greeks
+        self.greeks_cache = greeks_cache
+        # Last solved implied volatility per contract, used to warm-start the solver
+        self.previous_ivs = {}
+        # Trading sessions already cached per (ticker, multiplier, timespan)
+        self.coverage = CoverageIndex()
+        # Bumped whenever a resolution's stored bars change; used by BarCache
+        self.data_versions = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        # Coalesces identical in-flight fetches; see single_flight.stats()
+        self.single_flight = SingleFlight()
 
     def fetch_aggregates(self, ticker, multiplier, timespan, start_date, end_date):
+        """
+        Bars for [start_date, end_date] ("YYYY-MM-DD", inclusive), ordered by
+        date.
+
+        Only the trading sessions missing from the coverage index are
+        requested from Polygon, one call per contiguous missing sub-range;
+        the merged cached result is returned as detached AggregateData rows.
+        Concurrent identical calls share a single fetch.
+        """
+        rows = self.single_flight.do(
+            ("aggregates", ticker, multiplier, timespan, start_date, end_date),
+            self._fetch_aggregates,
+            ticker,
+            multiplier,
+            timespan,
+            start_date,
+            end_date,
+        )
+        return list(rows)
+
+    def _fetch_aggregates(self, ticker, multiplier, timespan, start_date, end_date):
+        key = (ticker, multiplier, timespan)
+        try:
+            with self._key_lock(key):
+                # Each call (and so each worker thread) uses its own DB session
+                with session_scope() as session:
+                    missing = self.coverage.missing(
+                        session, key, start_date, end_date
+                    )
+                # Page through Polygon before the write transaction opens, so
+                # no session is held while waiting on the rate limiter
+                fetched = [
+                    (first, last, list(self._polygon_batches(key, first, last)))
+                    for first, last in missing
+                ]
+
+                with session_scope() as session:
+                    for first, last, batches in fetched:
+                        self._store_range(session, key, first, last, batches)
+                    session.flush()
+
+                    rows = (
+                        session.query(AggregateData)
+                        .filter(
+                            AggregateData.ticker == ticker,
+                            AggregateData.multiplier == multiplier,
+                            AggregateData.timespan == timespan,
+                            AggregateData.date >= _session_start(start_date),
+                            AggregateData.date < _session_start(end_date, days=1),
+                        )
+                        .order_by(AggregateData.date)
+                        .all()
+                    )
+                    session.expunge_all()
+                    return rows
+        except Exception:
+            # The coverage rows were rolled back with the bars
+            self.coverage.invalidate(key)
+            raise
+
+    def _store_range(self, session, key, first, last, batches):
+        """
+        Replace any partial rows for sessions [first, last] with freshly
+        pulled batches and mark the range as covered.
+        """
+        self._delete_range(session, key, first, last)
+        for batch in batches:
+            _insert_batch(session, key, batch)
+        self.coverage.mark(session, key, first, last)
+        self._bump_version(key)
+
+    def _delete_range(self, session, key, first, last):
+        ticker, multiplier, timespan = key
+        session.query(AggregateData).filter(
+            AggregateData.ticker == ticker,
+            AggregateData.multiplier == multiplier,
+            AggregateData.timespan == timespan,
+            AggregateData.date >= _session_start(first),
+            AggregateData.date < _session_start(last, days=1),
+        ).delete(synchronize_session=False)
+
+    def _polygon_batches(self, key, first, last, batch_rows=DEFAULT_BATCH_ROWS):
+        """
+        Lazily page through list_aggs for sessions [first, last], grouped
+        into columnar batches. Each page costs one rate-limiter token.
+        """
+        ticker, multiplier, timespan = key
+        aggs = self.client.list_aggs(
+            ticker=ticker,
+            multiplier=multiplier,
+            timespan=timespan,
+            from_=str(first),
+            to=str(last),
+            limit=AGGS_PAGE_LIMIT,
+        )
+        rows = []
+        for agg in aggs:
+            rows.append(
+                (agg.timestamp, agg.open, agg.high, agg.low, agg.close, agg.volume)
+            )
+            if len(rows) == batch_rows:
+                yield _bar_columns(rows)
+                rows = []
+        if rows:
+            yield _bar_columns(rows)
+
+    def _bump_version(self, key):
+        with self._lock:
+            self.data_versions[key] = self.data_versions.get(key, 0) + 1
+            return self.data_versions[key]
+
+    def stream_aggregates(
+        self,
+        ticker,
+        multiplier,
+        timespan,
+        start_date,
+        end_date,
+        batch_rows=DEFAULT_BATCH_ROWS,
+    ):
+        """
+        Bars for [start_date, end_date] as an iterator of columnar batches,
+        in date order, with memory bounded by batch_rows.
+
+        Cached sessions are read back through a server-side cursor; missing
+        ones are paged from Polygon and each batch is inserted and committed
+        in its own transaction before it is yielded. A missing run is marked
+        as covered only once it has been fully consumed, so an abandoned
+        stream is simply fetched again next time. No lock is held while the
+        consumer has a batch, so other fetches of the same bars proceed.
+
+        :return: Generator of dicts of arrays keyed by BAR_COLUMNS
+            (timestamps in epoch ms).
+        """
+        key = (ticker, multiplier, timespan)
         with session_scope() as session:
-            cached_data = (
-                session.query(AggregateData)
+            runs = self.coverage.runs(session, key, start_date, end_date)
+        for first, last, covered in runs:
+            if covered:
+                yield from self._stored_batches(key, first, last, batch_rows)
+            else:
+                yield from self._streamed_batches(key, first, last, batch_rows)
+
+    def _stored_batches(self, key, first, last, batch_rows):
+        ticker, multiplier, timespan = key
+        with session_scope() as session:
+            query = (
+                session.query(
+                    AggregateData.date,
+                    AggregateData.open,
+                    AggregateData.high,
+                    AggregateData.low,
+                    AggregateData.close,
+                    AggregateData.volume,
+                )
                 .filter(
                     AggregateData.ticker == ticker,
-                    AggregateData.date
-                    >= datetime.strptime(start_date, "%Y-%m-%d").replace(
-                        tzinfo=pytz.UTC
-                    ),
-                    AggregateData.date
-                    <= datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=pytz.UTC),
+                    AggregateData.multiplier == multiplier,
+                    AggregateData.timespan == timespan,
+                    AggregateData.date >= _session_start(first),
+                    AggregateData.date < _session_start(last, days=1),
                 )
-                .all()
+                .order_by(AggregateData.date)
+                .yield_per(batch_rows)
             )
+            rows = []
+            for row in query:
+                rows.append(row)
+                if len(rows) == batch_rows:
+                    yield rows_to_columns(rows)
+                    rows = []
+            if rows:
+                yield rows_to_columns(rows)
 
-            if cached_data:
-                return cached_data
+    def _streamed_batches(self, key, first, last, batch_rows):
+        """
+        Page sessions [first, last] from Polygon, storing each batch before
+        yielding it.
 
-            aggs = self.client.list_aggs(
-                ticker=ticker,
-                multiplier=multiplier,
-                timespan=timespan,
-                from_=start_date,
-                to=end_date,
-            )
-            for agg in aggs:
-                new_record = AggregateData(
-                    ticker=ticker,
-                    date=datetime.fromtimestamp(agg.timestamp / 1000, tz=pytz.UTC),
-                    open=agg.open,
-                    high=agg.high,
-                    low=agg.low,
-                    close=agg.close,
-                    volume=agg.volume,
+        The key lock is taken per batch (fetch and insert) and released
+        before the yield. If another writer stores bars for the key while
+        the consumer holds a batch, the stream stops storing, since its rows
+        may have been replaced, and leaves the run uncovered.
+        """
+        lock = self._key_lock(key)
+        batches = self._polygon_batches(key, first, last, batch_rows)
+        try:
+            with lock:
+                with session_scope() as session:
+                    self._delete_range(session, key, first, last)
+                version = self._bump_version(key)
+            while True:
+                with lock:
+                    batch = next(batches, None)
+                    if batch is not None and self.data_versions[key] == version:
+                        with session_scope() as session:
+                            _insert_batch(session, key, batch)
+                        version = self._bump_version(key)
+                if batch is None:
+                    break
+                yield batch
+            with lock:
+                if self.data_versions[key] == version:
+                    with session_scope() as session:
+                        self.coverage.mark(session, key, first, last)
+        except Exception:
+            self.coverage.invalidate(key)
+            raise
+        finally:
+            batches.close()
+
+    def _key_lock(self, key):
+        """
+        Lock serializing fetches of the same (ticker, multiplier, timespan).
+        """
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def fetch_aggregates_many(
+        self, tickers, multiplier, timespan, start_date, end_date, max_workers=8
+    ):
+        """
+        fetch_aggregates for many tickers on a thread pool.
+
+        Workers share the client's token bucket, so a large backfill runs at
+        the plan's request budget rather than one ticker at a time.
+
+        :return: Dict of ticker -> AggregateData rows, or None for tickers
+            whose fetch failed (the error is logged).
+        """
+
+        def fetch(ticker):
+            try:
+                return self.fetch_aggregates(
+                    ticker, multiplier, timespan, start_date, end_date
                 )
-                session.add(new_record)
-            return aggs
+            except Exception as e:
+                logging.error(f"Failed to fetch aggregates for {ticker}: {e}")
+                return None
+
+        tickers = list(dict.fromkeys(tickers))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(tickers, executor.map(fetch, tickers)))
+
+    def risk_free_rate(self, T, fallback=0.01):
+        """
+        Zero rate(s) for maturities T from the yield curve, or a flat fallback
+        rate when the curve cannot be loaded.
+        """
+        try:
+            return self.yield_curve.rate(T)
+        except Exception as e:
+            logging.warning(f"Yield curve unavailable, using flat {fallback}: {e}")
+            return fallback
 
     def fetch_option_greeks_yfinance(self, ticker, option_type="call"):
         """
         Fetch option data from yfinance and calculate Greeks using Black-Scholes.
+
+        Concurrent calls for the same ticker and option type share one fetch
+        (and one set of OptionData writes).
         """
+        greeks_list = self.single_flight.do(
+            ("option_greeks", ticker, option_type),
+            self._fetch_option_greeks_yfinance,
+            ticker,
+            option_type,
+        )
+        return None if greeks_list is None else list(greeks_list)
+
+    def _fetch_option_greeks_yfinance(self, ticker, option_type):
         try:
             # Fetch the option chain
             stock = yf.Ticker(ticker)
@@ -71,18 +406,44 @@ class PolygonClient:
             # Choose call or put options
             options_data = opt_chain.calls if option_type == "call" else opt_chain.puts
 
+            S = stock.history(period="1d")["Close"].iloc[-1]
+            T = (
+                datetime.strptime(expiration, "%Y-%m-%d") - datetime.utcnow()
+            ).days / 365.0
+            r = float(self.risk_free_rate(T))
+
+            # Invert mid prices for the whole chain; yfinance's impliedVolatility
+            # is only used for strikes the solver cannot price.
+            mid = ((options_data["bid"] + options_data["ask"]) / 2).to_numpy()
+            mid = np.where(mid > 0, mid, options_data["lastPrice"].to_numpy())
+            symbols = options_data["contractSymbol"]
+            solved_iv, converged = implied_volatility_batch(
+                mid,
+                S,
+                options_data["strike"].to_numpy(),
+                T,
+                r,
+                option_type,
+                initial_sigma=symbols.map(self.previous_ivs).to_numpy(dtype=float),
+            )
+            sigmas = np.where(
+                converged, solved_iv, options_data["impliedVolatility"].to_numpy()
+            )
+            self.previous_ivs.update(zip(symbols[converged], solved_iv[converged]))
+
             # Iterate over options to calculate Greeks
+            greeks_fn = (
+                self.greeks_cache.calculate_greeks
+                if self.greeks_cache is not None
+                else calculate_greeks
+            )
             greeks_list = []
-            for idx, option in options_data.iterrows():
-                S = stock.history(period="1d")["Close"].iloc[-1]
+            for (idx, option), sigma, price in zip(
+                options_data.iterrows(), sigmas, mid
+            ):
                 K = option["strike"]
-                T = (
-                    datetime.strptime(expiration, "%Y-%m-%d") - datetime.utcnow()
-                ).days / 365.0
-                r = 0.01  # Assume 1% risk-free rate; you might want to fetch current rates
-                sigma = option["impliedVolatility"]
 
-                greeks = calculate_greeks(S, K, T, r, sigma, option_type)
+                greeks = greeks_fn(S, K, T, r, sigma, option_type)
                 greeks["ticker"] = option["contractSymbol"]
                 greeks["date"] = datetime.utcnow()
                 greeks_list.append(greeks)
@@ -97,6 +458,8 @@ class PolygonClient:
                         theta=greeks["theta"],
                         vega=greeks["vega"],
                         rho=greeks["rho"],
+                        price=float(price),
+                        iv=float(sigma),
                     )
                     session.add(new_record)
 
@@ -105,7 +468,3 @@ class PolygonClient:
         except Exception as e:
             print(f"Failed to fetch option Greeks from yfinance: {e}")
             return None
-
-
-# Don't forget to close the session
-session.close()
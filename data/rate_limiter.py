@@ -0,0 +1,62 @@
+# data/rate_limiter.py
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker that calls an API.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one, blocking until it is available. A full bucket allows
+    a burst of `capacity` requests, after which callers are paced at `rate`.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param rate: Tokens added per second.
+        :param capacity: Bucket size (burst); defaults to max(1, rate).
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited = 0.0
+
+    @classmethod
+    def per_minute(cls, requests, burst=None):
+        """
+        Bucket for a plan allowing `requests` per minute.
+        """
+        return cls(requests / 60.0, burst if burst is not None else requests)
+
+    def _refill(self, now):
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Take tokens, sleeping until they are available.
+
+        :param timeout: Give up after this many seconds.
+        :return: Whether the tokens were taken.
+        """
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.acquired += tokens
+                    self.waited += now - started
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if timeout is not None and now - started + wait > timeout:
+                return False
+            time.sleep(wait)
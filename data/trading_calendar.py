@@ -0,0 +1,111 @@
+# data/trading_calendar.py
+
+from datetime import date, timedelta
+from functools import lru_cache
+import numpy as np
+
+
+def _observed(day):
+    """
+    Saturday holidays are observed on Friday, Sunday holidays on Monday.
+    """
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _nth_weekday(year, month, weekday, n):
+    """
+    n-th (1-based) given weekday of a month; n=-1 is the last one.
+    """
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    """
+    Gregorian Easter Sunday (anonymous computus).
+    """
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    return date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year):
+    """
+    Full-day NYSE holidays for a year (regular rules; one-off closures such
+    as national days of mourning are not included).
+    """
+    holidays = [
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _observed(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),
+    ]
+    # New Year's Day falling on a Saturday is not observed on the prior Friday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.append(_observed(new_year))
+    if year >= 2022:
+        holidays.append(_observed(date(year, 6, 19)))  # Juneteenth
+    return tuple(sorted(holidays))
+
+
+@lru_cache(maxsize=None)
+def _calendar(first_year, last_year):
+    holidays = [
+        day for year in range(first_year, last_year + 1) for day in nyse_holidays(year)
+    ]
+    return np.busdaycalendar(holidays=np.array(holidays, dtype="datetime64[D]"))
+
+
+def trading_sessions(start, end):
+    """
+    NYSE trading sessions between two dates, inclusive.
+
+    :param start: datetime.date (or "YYYY-MM-DD").
+    :param end: datetime.date (or "YYYY-MM-DD").
+    :return: Sorted datetime64[D] array of session dates.
+    """
+    start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+    if end < start:
+        return np.empty(0, dtype="datetime64[D]")
+    calendar = _calendar(start.item().year, end.item().year)
+    days = np.arange(start, end + 1, dtype="datetime64[D]")
+    return days[np.is_busday(days, busdaycal=calendar)]
+
+
+def session_runs(sessions):
+    """
+    Split sorted session dates into runs of consecutive sessions, where
+    weekends and holidays between two sessions do not break a run.
+
+    :param sessions: Sorted subset of a trading_sessions() array.
+    :return: List of (first, last) datetime64[D] pairs.
+    """
+    if len(sessions) == 0:
+        return []
+    calendar = _calendar(
+        sessions[0].item().year, sessions[-1].item().year + 1
+    )
+    next_session = np.busday_offset(sessions[:-1], 1, roll="forward", busdaycal=calendar)
+    breaks = np.flatnonzero(sessions[1:] != next_session)
+    starts = np.concatenate([sessions[:1], sessions[breaks + 1]])
+    stops = np.concatenate([sessions[breaks], sessions[-1:]])
+    return list(zip(starts, stops))
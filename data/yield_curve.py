@@ -0,0 +1,236 @@
+# data/yield_curve.py
+
+import json
+import logging
+import math
+import os
+import time
+from datetime import date
+import numpy as np
+import requests
+
+# FRED Treasury constant maturity series and their maturities in years
+TREASURY_SERIES = {
+    "DGS1MO": 1 / 12,
+    "DGS3MO": 0.25,
+    "DGS6MO": 0.5,
+    "DGS1": 1.0,
+    "DGS2": 2.0,
+    "DGS3": 3.0,
+    "DGS5": 5.0,
+    "DGS7": 7.0,
+    "DGS10": 10.0,
+    "DGS20": 20.0,
+    "DGS30": 30.0,
+}
+
+FRED_OBSERVATIONS_URL = "https://api.stlouisfed.org/fred/series/observations"
+DEFAULT_CACHE_PATH = os.path.join("data", "cache", "treasury_yields.json")
+FIXTURE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "treasury_yields.json"
+)
+
+
+class YieldCurve:
+    """
+    Continuously compounded zero curve with precomputed interpolation.
+
+    Log discount factors r(T) * T are interpolated linearly between pillars
+    (piecewise-flat forwards); rates are held flat beyond the first and last
+    pillar, so a single-pillar curve is flat. Segment slopes are computed
+    once, so a lookup is one searchsorted and a multiply-add per maturity.
+    """
+
+    def __init__(self, maturities, rates):
+        """
+        :param maturities: Pillar maturities in years.
+        :param rates: Continuously compounded zero rates at the pillars.
+        """
+        order = np.argsort(maturities)
+        self.maturities = np.asarray(maturities, dtype=float)[order]
+        self.rates = np.asarray(rates, dtype=float)[order]
+        self._log_discount = self.rates * self.maturities
+        self._slopes = np.diff(self._log_discount) / np.diff(self.maturities)
+        if not self._slopes.size:
+            # A single pillar is a flat curve: one segment with no slope
+            self._slopes = np.zeros(1)
+
+    @classmethod
+    def from_treasury_points(cls, points):
+        """
+        Build a curve from FRED yields in percent (bond-equivalent, i.e.
+        semi-annually compounded), keyed by series id.
+        """
+        points = {sid: y for sid, y in points.items() if sid in TREASURY_SERIES}
+        maturities = [TREASURY_SERIES[sid] for sid in points]
+        rates = [2.0 * math.log1p(y / 200.0) for y in points.values()]
+        return cls(maturities, rates)
+
+    def rate(self, T):
+        """
+        Vectorized zero-rate lookup.
+
+        :param T: Maturity or array of maturities in years.
+        :return: Continuously compounded rates with the shape of T.
+        """
+        T = np.asarray(T, dtype=float)
+        t = np.clip(T, self.maturities[0], self.maturities[-1])
+        segment = np.clip(
+            np.searchsorted(self.maturities, t) - 1, 0, len(self._slopes) - 1
+        )
+        log_discount = self._log_discount[segment] + self._slopes[segment] * (
+            t - self.maturities[segment]
+        )
+        return log_discount / t
+
+    def discount(self, T):
+        """
+        Discount factors for an array of maturities.
+        """
+        T = np.asarray(T, dtype=float)
+        return np.exp(-self.rate(T) * T)
+
+
+class YieldCurveProvider:
+    """
+    Loads Treasury points at most once per day and serves the built curve.
+
+    Points are fetched from FRED on the first request of a day, persisted to
+    a local JSON cache, and reused by every later lookup that day. Passing a
+    fixture_path (e.g. FIXTURE_PATH) replaces FRED entirely, which keeps
+    tests offline.
+
+    When FRED cannot be reached the last persisted points are used, whatever
+    their date, and FRED is not retried until retry_interval has passed.
+    """
+
+    def __init__(
+        self,
+        api_key=None,
+        cache_path=DEFAULT_CACHE_PATH,
+        fixture_path=None,
+        retry_interval=900.0,
+    ):
+        """
+        :param api_key: FRED API key; defaults to get_fred_api_key().
+        :param cache_path: JSON file the daily points are persisted to.
+        :param fixture_path: Optional JSON file used instead of FRED.
+        :param retry_interval: Seconds to wait after a failed load before
+            trying FRED again.
+        """
+        self.api_key = api_key
+        self.cache_path = cache_path
+        self.fixture_path = fixture_path
+        self.retry_interval = retry_interval
+        self._curve = None
+        self._curve_date = None
+        self._failed_at = None
+
+    def get_curve(self, as_of=None) -> YieldCurve:
+        """
+        Return the curve for as_of (default today), loading it if needed.
+        """
+        as_of = as_of or date.today()
+        if self._curve is not None and self._curve_date == as_of:
+            return self._curve
+
+        points = self._load_cached(as_of)
+        if points is None:
+            if (
+                self._failed_at is not None
+                and time.monotonic() - self._failed_at < self.retry_interval
+            ):
+                return self._stale_curve()
+            try:
+                points = self._load_points(as_of)
+            except Exception as e:
+                self._failed_at = time.monotonic()
+                logging.warning(f"Treasury points unavailable, using last cached: {e}")
+                return self._stale_curve()
+            self._failed_at = None
+            self._save_cached(as_of, points)
+        self._curve = YieldCurve.from_treasury_points(points)
+        self._curve_date = as_of
+        return self._curve
+
+    def _stale_curve(self):
+        """
+        The most recent curve available without FRED. It is not tagged with
+        today's date, so FRED is tried again once the retry interval passes.
+        """
+        if self._curve is None:
+            points = self._load_cached(None)
+            if points is None:
+                raise ValueError("No Treasury curve loaded or cached.")
+            self._curve = YieldCurve.from_treasury_points(points)
+        return self._curve
+
+    def rate(self, T, as_of=None):
+        """
+        Vectorized zero-rate lookup on the current curve.
+        """
+        return self.get_curve(as_of).rate(T)
+
+    def _load_cached(self, as_of):
+        """
+        Persisted points for as_of, or for any date when as_of is None.
+        """
+        if not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, "r") as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Ignoring unreadable yield cache {self.cache_path}: {e}")
+            return None
+        if as_of is not None and cached.get("loaded_on") != as_of.isoformat():
+            return None
+        return cached["points"]
+
+    def _save_cached(self, as_of, points):
+        cache_dir = os.path.dirname(self.cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        with open(self.cache_path, "w") as f:
+            json.dump({"loaded_on": as_of.isoformat(), "points": points}, f)
+
+    def _load_points(self, as_of):
+        if self.fixture_path:
+            with open(self.fixture_path, "r") as f:
+                return json.load(f)["points"]
+        return self._fetch_fred(as_of)
+
+    def _fetch_fred(self, as_of):
+        """
+        Latest available observation on or before as_of for every series.
+        """
+        if self.api_key is None:
+            from config.config_manager import get_fred_api_key
+
+            self.api_key = get_fred_api_key()
+
+        points = {}
+        with requests.Session() as http:
+            for series_id in TREASURY_SERIES:
+                response = http.get(
+                    FRED_OBSERVATIONS_URL,
+                    params={
+                        "series_id": series_id,
+                        "api_key": self.api_key,
+                        "file_type": "json",
+                        "sort_order": "desc",
+                        "observation_end": as_of.isoformat(),
+                        "limit": 10,
+                    },
+                    timeout=10,
+                )
+                response.raise_for_status()
+                for observation in response.json()["observations"]:
+                    # FRED reports missing days (holidays) as "."
+                    if observation["value"] != ".":
+                        points[series_id] = float(observation["value"])
+                        break
+        if not points:
+            raise ValueError("FRED returned no Treasury yield observations.")
+        logging.info(f"Loaded {len(points)} Treasury yield points from FRED.")
+        return points
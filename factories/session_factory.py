@@ -27,8 +27,8 @@ def create_session_factory():
 
 
 def initialize_database(engine):
-    """Initialize the database by creating all tables."""
-    from models.models import AggregateData, OptionData  # Import all your models here
+    """Initialize the database by creating all tables and migrating columns."""
+    from data.migrations import migrate
 
-    Base.metadata.create_all(bind=engine)  # This will create the tables in the database
+    migrate(engine)
     logging.info("Database tables created successfully.")
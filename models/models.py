@@ -28,6 +28,8 @@ class AggregateData(Base):
     __tablename__ = "aggregate_data"
     id = Column(Integer, primary_key=True)
     ticker = Column(String)
+    multiplier = Column(Integer)  # Bar size, e.g. 5 with timespan "minute"
+    timespan = Column(String)  # "minute", "hour", "day", ...
     date = Column(DateTime)
     open = Column(Float)
     high = Column(Float)
@@ -46,3 +48,27 @@ class OptionData(Base):
     theta = Column(Float)
     vega = Column(Float)
     rho = Column(Float)
+    price = Column(Float)  # Market mid price at snapshot time
+    iv = Column(Float)  # Implied volatility used for the Greeks
+
+
+class Position(Base):
+    __tablename__ = "positions"
+    id = Column(Integer, primary_key=True)
+    ticker = Column(String)  # Option contract symbol, as in OptionData.ticker
+    underlying = Column(String)
+    option_type = Column(String)  # "call" or "put"
+    strike = Column(Float)
+    expiration = Column(DateTime)
+    quantity = Column(Float)  # Signed number of contracts
+    multiplier = Column(Float, default=100.0)
+
+
+class AggregateCoverage(Base):
+    __tablename__ = "aggregate_coverage"
+    id = Column(Integer, primary_key=True)
+    ticker = Column(String)
+    multiplier = Column(Integer)
+    timespan = Column(String)
+    start = Column(DateTime)  # First fully cached trading session
+    end = Column(DateTime)  # Last fully cached trading session
@@ -0,0 +1,98 @@
+# services/black_scholes_accuracy.py
+
+"""
+Accuracy harness for the scalar Black-Scholes fast path.
+
+Compares black_scholes() and calculate_greeks() against the original
+scipy.stats.norm based formulas over a dense grid of inputs and reports the
+worst error per output. Run with:
+
+    python -m services.black_scholes_accuracy
+"""
+
+import itertools
+import math
+import sys
+import numpy as np
+from scipy.stats import norm
+from services.black_scholes_service import (
+    FAST_PATH_TOLERANCE,
+    black_scholes,
+    calculate_greeks,
+)
+
+DEFAULT_GRID = {
+    "S": np.linspace(20.0, 300.0, 15),
+    "K": np.array([50.0, 90.0, 100.0, 110.0, 200.0]),
+    "T": np.array([1 / 365, 7 / 365, 30 / 365, 0.25, 0.5, 1.0, 2.0, 5.0]),
+    "r": np.array([-0.01, 0.0, 0.01, 0.05, 0.1]),
+    "sigma": np.array([0.01, 0.05, 0.1, 0.2, 0.4, 0.8, 1.5, 3.0]),
+}
+
+
+def reference_black_scholes(S, K, T, r, sigma, option_type="call"):
+    """
+    Black-Scholes price evaluated with scipy.stats.norm.
+    """
+    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+
+    if option_type == "call":
+        return S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
+    return K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+
+
+def reference_greeks(S, K, T, r, sigma, option_type="call"):
+    """
+    Black-Scholes Greeks evaluated with scipy.stats.norm.
+    """
+    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+    sign = 1.0 if option_type == "call" else -1.0
+
+    return {
+        "delta": norm.cdf(d1) if option_type == "call" else -norm.cdf(-d1),
+        "gamma": norm.pdf(d1) / (S * sigma * math.sqrt(T)),
+        "theta": -(S * norm.pdf(d1) * sigma) / (2 * math.sqrt(T))
+        - sign * r * K * math.exp(-r * T) * norm.cdf(sign * d2),
+        "vega": S * norm.pdf(d1) * math.sqrt(T) / 100,
+        "rho": sign * K * T * math.exp(-r * T) * norm.cdf(sign * d2) / 100,
+    }
+
+
+def run_accuracy_check(grid=None):
+    """
+    Evaluate both implementations over every grid point and option type.
+
+    :param grid: Optional dict of arrays keyed by S, K, T, r and sigma.
+    :return: Dict mapping output name to its worst scaled error.
+    """
+    grid = grid or DEFAULT_GRID
+    worst = {}
+    points = itertools.product(
+        grid["S"], grid["K"], grid["T"], grid["r"], grid["sigma"], ("call", "put")
+    )
+    for S, K, T, r, sigma, option_type in points:
+        fast = calculate_greeks(S, K, T, r, sigma, option_type)
+        fast["price"] = black_scholes(S, K, T, r, sigma, option_type)
+        reference = reference_greeks(S, K, T, r, sigma, option_type)
+        reference["price"] = reference_black_scholes(S, K, T, r, sigma, option_type)
+        for name, expected in reference.items():
+            error = abs(fast[name] - expected) / max(1.0, abs(expected))
+            worst[name] = max(worst.get(name, 0.0), error)
+    return worst
+
+
+def main():
+    worst = run_accuracy_check()
+    for name, error in worst.items():
+        print(f"{name:>6}: max scaled error {error:.3e}")
+    if max(worst.values()) > FAST_PATH_TOLERANCE:
+        print(f"FAILED: tolerance is {FAST_PATH_TOLERANCE:.1e}")
+        return 1
+    print(f"OK: within {FAST_PATH_TOLERANCE:.1e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
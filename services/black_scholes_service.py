@@ -1,35 +1,79 @@
 import math
-from scipy.stats import norm
+import numpy as np
+from scipy.special import ndtr
+
+GREEK_NAMES = ("price", "delta", "gamma", "theta", "vega", "rho")
+SECOND_ORDER_GREEK_NAMES = (
+    "vanna",
+    "volga",
+    "charm",
+    "speed",
+    "zomma",
+    "vanna_vol",
+    "ultima",
+)
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+_INV_SQRT_2 = 1.0 / math.sqrt(2.0)
+
+# Maximum error of the scalar fast path against scipy.stats.norm, measured as
+# |fast - reference| / max(1, |reference|) by services/black_scholes_accuracy.py
+FAST_PATH_TOLERANCE = 1e-12
+
+
+def _norm_cdf(x):
+    """
+    Standard normal CDF via math.erfc, which stays accurate in both tails.
+    """
+    return 0.5 * math.erfc(-x * _INV_SQRT_2)
+
+
+def _norm_pdf(x):
+    """
+    Standard normal PDF.
+    """
+    return _INV_SQRT_2PI * math.exp(-0.5 * x * x)
 
 
 def black_scholes(S, K, T, r, sigma, option_type="call"):
     """
     Calculate the Black-Scholes option price.
+
+    Uses math.erfc instead of scipy.stats.norm to avoid its per-call argument
+    validation; results match the scipy-based formula to within
+    FAST_PATH_TOLERANCE (see services/black_scholes_accuracy.py).
     """
-    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
+    sqrt_t = math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    discount = math.exp(-r * T)
 
     if option_type == "call":
-        price = S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
+        price = S * _norm_cdf(d1) - K * discount * _norm_cdf(d2)
     else:
-        price = K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+        price = K * discount * _norm_cdf(-d2) - S * _norm_cdf(-d1)
     return price
 
 
 def calculate_greeks(S, K, T, r, sigma, option_type="call"):
     """
     Calculate the Greeks for an option using the Black-Scholes formula.
+
+    Same fast path and tolerance as black_scholes.
     """
-    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
+    sqrt_t = math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    sign = 1.0 if option_type == "call" else -1.0
+    discount = math.exp(-r * T)
+    pdf_d1 = _norm_pdf(d1)
+    cdf_d2 = _norm_cdf(sign * d2)
 
-    delta = norm.cdf(d1) if option_type == "call" else -norm.cdf(-d1)
-    gamma = norm.pdf(d1) / (S * sigma * math.sqrt(T))
-    theta = -(S * norm.pdf(d1) * sigma) / (2 * math.sqrt(T)) - r * K * math.exp(
-        -r * T
-    ) * norm.cdf(d2 if option_type == "call" else -d2)
-    vega = S * norm.pdf(d1) * math.sqrt(T)
-    rho = K * T * math.exp(-r * T) * norm.cdf(d2 if option_type == "call" else -d2)
+    delta = _norm_cdf(d1) if option_type == "call" else -_norm_cdf(-d1)
+    gamma = pdf_d1 / (S * sigma * sqrt_t)
+    theta = -(S * pdf_d1 * sigma) / (2 * sqrt_t) - sign * r * K * discount * cdf_d2
+    vega = S * pdf_d1 * sqrt_t
+    rho = sign * K * T * discount * cdf_d2
 
     return {
         "delta": delta,
@@ -38,3 +82,299 @@ def calculate_greeks(S, K, T, r, sigma, option_type="call"):
         "vega": vega / 100,  # Vega is often represented per 1% change in volatility
         "rho": rho / 100,  # Rho is often represented per 1% change in rates
     }
+
+
+def _call_mask(option_type):
+    """
+    Convert an option type (scalar or array of "call"/"put" strings, or booleans
+    where True means call) into a boolean array.
+    """
+    option_type = np.asarray(option_type)
+    if option_type.dtype == bool:
+        return option_type
+    return option_type == "call"
+
+
+def _broadcast_inputs(S, K, T, r, sigma, option_type):
+    """
+    Broadcast the pricing inputs against each other as float64 arrays.
+    """
+    return np.broadcast_arrays(
+        np.asarray(S, dtype=float),
+        np.asarray(K, dtype=float),
+        np.asarray(T, dtype=float),
+        np.asarray(r, dtype=float),
+        np.asarray(sigma, dtype=float),
+        _call_mask(option_type),
+    )
+
+
+def _store(out, name, value):
+    """
+    Write a result into a caller-supplied buffer when one is given.
+    """
+    if out is None or out.get(name) is None:
+        return value
+    np.copyto(out[name], value)
+    return out[name]
+
+
+def _intermediates(S, K, T, r, sigma, is_call):
+    """
+    Compute the quantities shared by the price and every Greek.
+
+    Expired contracts (T <= 0) and zero-volatility rows have no diffusion left,
+    so d1 and d2 collapse to +/- infinity depending on which side of the
+    forward the strike sits; the closed forms then reduce to the intrinsic or
+    discounted forward payoff without per-row branching.
+    """
+    sign = np.where(is_call, 1.0, -1.0)
+    tau = np.maximum(T, 0.0)
+    sqrt_t = np.sqrt(tau)
+    discount = np.exp(-r * tau)
+    vol_sqrt_t = sigma * sqrt_t
+    degenerate = vol_sqrt_t <= 0.0
+    safe_vol_sqrt_t = np.where(degenerate, 1.0, vol_sqrt_t)
+
+    strike_pv = K * discount
+    log_moneyness = np.log(S / strike_pv)
+    d1 = np.where(
+        degenerate,
+        np.copysign(np.inf, log_moneyness),
+        (log_moneyness + 0.5 * vol_sqrt_t**2) / safe_vol_sqrt_t,
+    )
+    d2 = d1 - vol_sqrt_t
+    return {
+        "sign": sign,
+        "tau": tau,
+        "sqrt_t": sqrt_t,
+        "discount": discount,
+        "strike_pv": strike_pv,
+        "safe_vol_sqrt_t": safe_vol_sqrt_t,
+        "d1": d1,
+        "d2": d2,
+        "cdf_d1": ndtr(sign * d1),
+        "cdf_d2": ndtr(sign * d2),
+    }
+
+
+def black_scholes_batch(S, K, T, r, sigma, option_type="call", out=None):
+    """
+    Calculate Black-Scholes prices for arrays of contracts.
+
+    :param S: Spot prices.
+    :param K: Strike prices.
+    :param T: Times to expiry in years.
+    :param r: Risk-free rates.
+    :param sigma: Volatilities.
+    :param option_type: "call"/"put", an array of those, or a boolean call mask.
+    :param out: Optional preallocated array for the prices.
+    :return: Array of option prices.
+    """
+    S, K, T, r, sigma, is_call = _broadcast_inputs(S, K, T, r, sigma, option_type)
+    m = _intermediates(S, K, T, r, sigma, is_call)
+    price = m["sign"] * (S * m["cdf_d1"] - m["strike_pv"] * m["cdf_d2"])
+    return _store(None if out is None else {"price": out}, "price", price)
+
+
+def price_and_greeks(
+    S, K, T, r, sigma, option_type="call", second_order=False, out=None
+):
+    """
+    Evaluate the price and Greeks in one pass over the shared intermediates.
+
+    d1, d2, sqrt(T) and exp(-rT) are computed once and reused by every output.
+    Works on scalars (returns floats) or arrays (returns arrays broadcast
+    against each other).
+
+    :param S: Spot prices.
+    :param K: Strike prices.
+    :param T: Times to expiry in years.
+    :param r: Risk-free rates.
+    :param sigma: Volatilities.
+    :param option_type: "call"/"put", an array of those, or a boolean call mask.
+    :param second_order: Also return vanna, volga, charm and the third-order
+        speed, zomma (dGamma/dsigma), vanna_vol (dVanna/dsigma) and ultima
+        (dVolga/dsigma).
+    :param out: Optional dict of preallocated arrays keyed by output name.
+    :return: Dict keyed by GREEK_NAMES (vega and rho per 1%), plus
+        SECOND_ORDER_GREEK_NAMES in raw units when requested.
+    """
+    scalar = all(np.ndim(x) == 0 for x in (S, K, T, r, sigma, option_type))
+    results = _fused_greeks(S, K, T, r, sigma, option_type, second_order)
+    for name, value in results.items():
+        results[name] = float(value) if scalar else _store(out, name, value)
+    return results
+
+
+def _fused_greeks(S, K, T, r, sigma, option_type, second_order):
+    """
+    Array kernel behind price_and_greeks.
+    """
+    S, K, T, r, sigma, is_call = _broadcast_inputs(S, K, T, r, sigma, option_type)
+    m = _intermediates(S, K, T, r, sigma, is_call)
+    sign, sqrt_t, strike_pv = m["sign"], m["sqrt_t"], m["strike_pv"]
+    safe_vol_sqrt_t = m["safe_vol_sqrt_t"]
+
+    pdf_d1 = _INV_SQRT_2PI * np.exp(-0.5 * m["d1"] ** 2)
+    safe_sqrt_t = np.where(sqrt_t > 0.0, sqrt_t, 1.0)
+
+    gamma = pdf_d1 / (S * safe_vol_sqrt_t)
+    vega = S * pdf_d1 * sqrt_t
+    results = {
+        "price": sign * (S * m["cdf_d1"] - strike_pv * m["cdf_d2"]),
+        "delta": sign * m["cdf_d1"],
+        "gamma": gamma,
+        "theta": np.where(
+            T > 0.0,
+            -(S * pdf_d1 * sigma) / (2.0 * safe_sqrt_t)
+            - sign * r * strike_pv * m["cdf_d2"],
+            0.0,
+        ),
+        "vega": vega / 100,
+        "rho": sign * m["tau"] * strike_pv * m["cdf_d2"] / 100,
+    }
+
+    if second_order:
+        # pdf(d1) is already zero where d1 is infinite; zeroing d1/d2 there
+        # keeps the products below from turning into 0 * inf = nan.
+        finite = np.isfinite(m["d1"])
+        d1 = np.where(finite, m["d1"], 0.0)
+        d2 = np.where(finite, m["d2"], 0.0)
+        safe_sigma = np.where(sigma > 0.0, sigma, 1.0)
+        safe_tau = np.where(m["tau"] > 0.0, m["tau"], 1.0)
+        results["vanna"] = -pdf_d1 * d2 / safe_sigma
+        results["volga"] = vega * d1 * d2 / safe_sigma
+        results["charm"] = (
+            -pdf_d1
+            * (2.0 * r * m["tau"] - d2 * safe_vol_sqrt_t)
+            / (2.0 * safe_tau * safe_vol_sqrt_t)
+        )
+        results["speed"] = -gamma / S * (d1 / safe_vol_sqrt_t + 1.0)
+        results["zomma"] = gamma * (d1 * d2 - 1.0) / safe_sigma
+        results["vanna_vol"] = pdf_d1 * (d1 + d2 - d1 * d2**2) / safe_sigma**2
+        results["ultima"] = (
+            vega * (d1 * d2 * (d1 * d2 - 1.0) - d1**2 - d2**2) / safe_sigma**2
+        )
+    return results
+
+
+def calculate_greeks_batch(S, K, T, r, sigma, option_type="call", out=None):
+    """
+    Calculate Black-Scholes prices and Greeks for arrays of contracts.
+
+    All inputs are broadcast against each other; see black_scholes_batch for
+    the parameters.
+
+    :param out: Optional dict of preallocated arrays keyed by GREEK_NAMES.
+    :return: Dict of arrays keyed by GREEK_NAMES (vega and rho per 1%).
+    """
+    results = _fused_greeks(S, K, T, r, sigma, option_type, second_order=False)
+    for name, value in results.items():
+        results[name] = _store(out, name, value)
+    return results
+
+
+def implied_volatility_batch(
+    price,
+    S,
+    K,
+    T,
+    r,
+    option_type="call",
+    initial_sigma=None,
+    tol=1e-8,
+    max_iter=50,
+    lower=1e-6,
+    upper=5.0,
+    sigma_tol=1e-6,
+):
+    """
+    Invert Black-Scholes prices to implied volatilities for a whole chain.
+
+    Each iteration takes a vectorized Newton step on the rows that have not
+    converged yet; rows whose Newton step leaves the current [low, high]
+    bracket (or whose vega has vanished) fall back to bisection, so every row
+    converges even far from the money.
+
+    :param price: Market (mid) option prices.
+    :param S: Spot prices.
+    :param K: Strike prices.
+    :param T: Times to expiry in years.
+    :param r: Risk-free rates.
+    :param option_type: "call"/"put", an array of those, or a boolean call mask.
+    :param initial_sigma: Optional warm-start volatilities, e.g. the previous
+        snapshot's IVs. NaN or non-positive entries use the default guess.
+    :param tol: Absolute price tolerance for convergence.
+    :param sigma_tol: Volatility tolerance. A row within the price tolerance
+        only counts as converged once its volatility is pinned down too:
+        either a sigma_tol move changes the price by at least tol, or the
+        bracket is narrower than sigma_tol. Deep in-the-money rows whose time
+        value is below tol are otherwise flagged unconverged instead of
+        returning an arbitrary sigma.
+    :param max_iter: Maximum number of iterations.
+    :param lower: Lower volatility bound of the search bracket.
+    :param upper: Upper volatility bound of the search bracket.
+    :return: Tuple of (implied volatilities, converged flags). Rows that do not
+        converge, including prices outside the no-arbitrage bounds, are NaN.
+    """
+    S, K, T, r, price, is_call = _broadcast_inputs(S, K, T, r, price, option_type)
+    shape = S.shape
+    S, K, T, r, price, is_call = (
+        a.ravel() for a in (S, K, T, r, price, is_call)
+    )
+
+    discount = np.exp(-r * np.maximum(T, 0.0))
+    intrinsic = np.where(is_call, S - K * discount, K * discount - S)
+    ceiling = np.where(is_call, S, K * discount)
+    solvable = (T > 0.0) & (price > np.maximum(intrinsic, 0.0)) & (price < ceiling)
+
+    # Brenner-Subrahmanyam approximation as the cold-start guess
+    guess = np.sqrt(2.0 * np.pi / np.where(T > 0.0, T, 1.0)) * price / S
+    if initial_sigma is not None:
+        warm = np.broadcast_to(np.asarray(initial_sigma, dtype=float), shape).ravel()
+        guess = np.where(np.isfinite(warm) & (warm > 0.0), warm, guess)
+    sigma = np.clip(guess, lower, upper)
+
+    low = np.full(sigma.shape, lower)
+    high = np.full(sigma.shape, upper)
+    converged = np.zeros(sigma.shape, dtype=bool)
+    active = np.flatnonzero(solvable)
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        s, k, t, rate, sig, call = (
+            S[active],
+            K[active],
+            T[active],
+            r[active],
+            sigma[active],
+            is_call[active],
+        )
+        m = _intermediates(s, k, t, rate, sig, call)
+        diff = m["sign"] * (s * m["cdf_d1"] - m["strike_pv"] * m["cdf_d2"])
+        diff -= price[active]
+        vega = s * _INV_SQRT_2PI * np.exp(-0.5 * m["d1"] ** 2) * m["sqrt_t"]
+
+        # Price is increasing in sigma, so the sign of diff moves the bracket
+        lo = np.where(diff < 0.0, sig, low[active])
+        hi = np.where(diff > 0.0, sig, high[active])
+        low[active] = lo
+        high[active] = hi
+
+        error = np.abs(diff)
+        resolved = (vega * sigma_tol >= tol) | (hi - lo < sigma_tol)
+        done = (error < tol) & resolved
+        converged[active[done]] = True
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            newton = sig - diff / vega
+        in_bracket = (newton > lo) & (newton < hi) & (vega > 1e-12)
+        sigma[active] = np.where(in_bracket, newton, 0.5 * (lo + hi))
+        sigma[active[done]] = sig[done]
+
+        active = active[~done]
+
+    sigma = np.where(converged, sigma, np.nan)
+    return sigma.reshape(shape), converged.reshape(shape)
@@ -0,0 +1,162 @@
+# services/chain_screener.py
+
+import numpy as np
+
+INDEXED_FIELDS = ("delta", "dte", "moneyness", "iv")
+_FLOAT_COLUMNS = ("strike", "spot") + INDEXED_FIELDS
+
+
+class ChainScreener:
+    """
+    Columnar store of the latest option chain snapshots with sorted indexes.
+
+    Each indexed field (delta, DTE, moneyness = strike / spot, IV) keeps its
+    values in sorted order alongside row ids, so a range query is two binary
+    searches. New snapshots are merged into the indexes with searchsorted
+    inserts rather than a re-sort; replaced rows are tombstoned and the store
+    is compacted once dead rows outnumber live ones.
+    """
+
+    def __init__(self):
+        self._columns = {name: np.empty(0) for name in _FLOAT_COLUMNS}
+        self._is_call = np.empty(0, dtype=bool)
+        self._underlying = np.empty(0, dtype=object)
+        self._contract = np.empty(0, dtype=object)
+        self._alive = np.empty(0, dtype=bool)
+        self._row_of = {}
+        self._index = {
+            field: (np.empty(0), np.empty(0, dtype=np.int64))
+            for field in INDEXED_FIELDS
+        }
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def add_snapshot(
+        self, underlying, spot, contracts, option_types, strikes, dtes, deltas, ivs
+    ):
+        """
+        Add or replace the rows of one underlying's chain snapshot.
+
+        :param underlying: Underlying ticker.
+        :param spot: Spot price at snapshot time.
+        :param contracts: Contract symbols; a symbol seen before replaces its
+            old row.
+        :param option_types: "call"/"put" per contract.
+        :param strikes: Strike per contract.
+        :param dtes: Days to expiry per contract.
+        :param deltas: Delta per contract.
+        :param ivs: Implied volatility per contract.
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        new = {
+            "strike": strikes,
+            "spot": np.full(len(strikes), float(spot)),
+            "delta": np.asarray(deltas, dtype=float),
+            "dte": np.asarray(dtes, dtype=float),
+            "moneyness": strikes / spot,
+            "iv": np.asarray(ivs, dtype=float),
+        }
+        start = len(self._alive)
+        row_ids = np.arange(start, start + len(strikes))
+
+        for contract, row in zip(contracts, row_ids.tolist()):
+            old = self._row_of.get(contract)
+            if old is not None:
+                self._alive[old] = False
+            self._row_of[contract] = row
+
+        for name in _FLOAT_COLUMNS:
+            self._columns[name] = np.concatenate([self._columns[name], new[name]])
+        self._is_call = np.concatenate(
+            [self._is_call, np.asarray(option_types) == "call"]
+        )
+        self._underlying = np.concatenate(
+            [self._underlying, np.full(len(strikes), underlying, dtype=object)]
+        )
+        self._contract = np.concatenate(
+            [self._contract, np.asarray(contracts, dtype=object)]
+        )
+        self._alive = np.concatenate([self._alive, np.ones(len(strikes), dtype=bool)])
+
+        # Within one snapshot a repeated symbol keeps only its last row
+        self._alive[row_ids] = False
+        self._alive[[self._row_of[c] for c in set(contracts)]] = True
+
+        for field in INDEXED_FIELDS:
+            values, rows = self._index[field]
+            order = np.argsort(new[field], kind="stable")
+            new_values = new[field][order]
+            positions = np.searchsorted(values, new_values)
+            self._index[field] = (
+                np.insert(values, positions, new_values),
+                np.insert(rows, positions, row_ids[order]),
+            )
+
+        if len(self._alive) > 2 * len(self._row_of):
+            self.compact()
+
+    def compact(self):
+        """
+        Drop tombstoned rows and rebuild the indexes from the live rows.
+        """
+        live = np.flatnonzero(self._alive)
+        for name in _FLOAT_COLUMNS:
+            self._columns[name] = self._columns[name][live]
+        self._is_call = self._is_call[live]
+        self._underlying = self._underlying[live]
+        self._contract = self._contract[live]
+        self._alive = np.ones(len(live), dtype=bool)
+        self._row_of = {contract: row for row, contract in enumerate(self._contract)}
+        for field in INDEXED_FIELDS:
+            order = np.argsort(self._columns[field], kind="stable")
+            self._index[field] = (self._columns[field][order], order)
+
+    def _range(self, field, low, high):
+        values, rows = self._index[field]
+        start = np.searchsorted(values, low, side="left")
+        stop = np.searchsorted(values, high, side="right")
+        return rows[start:stop]
+
+    def query(self, option_type=None, underlyings=None, **ranges):
+        """
+        Find live contracts whose indexed fields fall in inclusive ranges.
+
+        The narrowest range is resolved by binary search on its index and the
+        remaining predicates are only checked on those candidates, e.g.
+        query(option_type="put", delta=(-0.30, -0.20), dte=(20, 45)).
+
+        :param option_type: Optional "call" or "put".
+        :param underlyings: Optional collection of underlying tickers.
+        :param ranges: (low, high) tuples keyed by INDEXED_FIELDS.
+        :return: Dict of arrays for the matches: contract, underlying,
+            option_type, strike, spot and the indexed fields.
+        """
+        unknown = set(ranges) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Fields are not indexed: {sorted(unknown)}")
+
+        if ranges:
+            candidates = {
+                field: self._range(field, *bounds) for field, bounds in ranges.items()
+            }
+            driver = min(candidates, key=lambda field: len(candidates[field]))
+            rows = candidates[driver]
+        else:
+            rows = np.arange(len(self._alive))
+
+        keep = self._alive[rows]
+        for field, (low, high) in ranges.items():
+            values = self._columns[field][rows]
+            keep &= (values >= low) & (values <= high)
+        if option_type is not None:
+            keep &= self._is_call[rows] == (option_type == "call")
+        if underlyings is not None:
+            keep &= np.isin(self._underlying[rows], list(underlyings))
+        rows = rows[keep]
+
+        result = {name: self._columns[name][rows] for name in _FLOAT_COLUMNS}
+        result["contract"] = self._contract[rows]
+        result["underlying"] = self._underlying[rows]
+        result["option_type"] = np.where(self._is_call[rows], "call", "put")
+        return result
@@ -0,0 +1,153 @@
+# services/greeks_cache.py
+
+import threading
+from collections import OrderedDict
+import numpy as np
+from services.black_scholes_service import (
+    GREEK_NAMES,
+    calculate_greeks_batch,
+)
+
+
+class GreeksCache:
+    """
+    Bounded LRU cache in front of the Black-Scholes pricer.
+
+    Inputs are quantized to configurable tick sizes and the price and Greeks
+    are evaluated at the quantized point, so every input that rounds to the
+    same key gets the same answer.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 100_000,
+        spot_tick: float = 0.01,
+        strike_tick: float = 0.01,
+        time_tick: float = 1 / (365 * 24),
+        rate_tick: float = 1e-5,
+        vol_tick: float = 1e-4,
+    ):
+        """
+        :param maxsize: Maximum number of cached entries before LRU eviction.
+        :param spot_tick: Quantization step for the spot price.
+        :param strike_tick: Quantization step for the strike.
+        :param time_tick: Quantization step for time to expiry, in years.
+        :param rate_tick: Quantization step for the risk-free rate.
+        :param vol_tick: Quantization step for volatility.
+        """
+        self.maxsize = maxsize
+        self.ticks = np.array([spot_tick, strike_tick, time_tick, rate_tick, vol_tick])
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """
+        :return: Dict of size, hits, misses, evictions and hit_rate.
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def _insert(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _scalar_entry(self, S, K, T, r, sigma, option_type):
+        steps = tuple(
+            int(round(value / tick))
+            for value, tick in zip((S, K, T, r, sigma), self.ticks.tolist())
+        )
+        key = steps + (option_type == "call",)
+        with self._lock:
+            entry = self._lookup(key)
+        if entry is None:
+            snapped = [step * tick for step, tick in zip(steps, self.ticks.tolist())]
+            # The batch kernel handles T or sigma snapped to zero, where the
+            # scalar formulas would divide by zero
+            greeks = calculate_greeks_batch(*snapped, option_type == "call")
+            entry = tuple(float(greeks[name]) for name in GREEK_NAMES)
+            with self._lock:
+                self._insert(key, entry)
+        return entry
+
+    def black_scholes(self, S, K, T, r, sigma, option_type="call"):
+        """
+        Cached equivalent of black_scholes_service.black_scholes.
+        """
+        return self._scalar_entry(S, K, T, r, sigma, option_type)[0]
+
+    def calculate_greeks(self, S, K, T, r, sigma, option_type="call"):
+        """
+        Cached equivalent of black_scholes_service.calculate_greeks.
+        """
+        entry = self._scalar_entry(S, K, T, r, sigma, option_type)
+        return dict(zip(GREEK_NAMES[1:], entry[1:]))
+
+    def calculate_greeks_batch(self, S, K, T, r, sigma, option_type="call"):
+        """
+        Cached equivalent of black_scholes_service.calculate_greeks_batch.
+
+        Rows are split into hits and misses; only the misses are sent to the
+        vectorized kernel, in a single call.
+
+        :return: Dict of 1-D arrays keyed by GREEK_NAMES.
+        """
+        S, K, T, r, sigma, option_type = np.broadcast_arrays(
+            S, K, T, r, sigma, option_type
+        )
+        inputs = np.stack([np.ravel(x).astype(float) for x in (S, K, T, r, sigma)])
+        steps = np.rint(inputs / self.ticks[:, None]).astype(np.int64)
+        is_call = np.ravel(option_type)
+        if is_call.dtype != bool:
+            is_call = is_call == "call"
+        keys = list(zip(*steps.tolist(), is_call.tolist()))
+
+        results = np.empty((len(GREEK_NAMES), len(keys)))
+        missing = []
+        with self._lock:
+            for row, key in enumerate(keys):
+                entry = self._lookup(key)
+                if entry is None:
+                    missing.append(row)
+                else:
+                    results[:, row] = entry
+
+        if missing:
+            snapped = steps[:, missing] * self.ticks[:, None]
+            computed = calculate_greeks_batch(*snapped, is_call[missing])
+            computed = np.stack([computed[name] for name in GREEK_NAMES])
+            results[:, missing] = computed
+            with self._lock:
+                for column, row in enumerate(missing):
+                    self._insert(keys[row], tuple(computed[:, column].tolist()))
+
+        return dict(zip(GREEK_NAMES, results))
@@ -0,0 +1,188 @@
+# services/live_greeks.py
+
+import time
+import numpy as np
+from services.black_scholes_service import price_and_greeks
+
+LIVE_GREEK_NAMES = ("price", "delta", "gamma", "vega")
+THIRD_ORDER_GREEK_NAMES = ("speed", "zomma", "vanna_vol", "ultima")
+
+# Fractions of the trusted spot and vol range at which third-order Greeks are
+# sampled to bound them over the whole range
+_ENVELOPE_STEPS = np.linspace(-1.0, 1.0, 5)
+
+
+class TaylorGreeks:
+    """
+    Live chain values from a second-order Taylor expansion around the last
+    full Black-Scholes evaluation.
+
+    Between full reprices a tick costs a handful of multiply-adds per
+    contract: spot and volatility moves are applied through delta, gamma,
+    vega, vanna, volga and speed captured at the anchor. Each tick also
+    carries an error bound from the Lagrange remainder of the expansion,
+    (M_sss |dS|**3 + 3 M_ssv dS**2 |dvol| + 3 M_svv |dS| dvol**2
+    + M_vvv |dvol|**3) / 6, where each M is the largest |speed|, |zomma|,
+    |vanna_vol| or |ultima| over the trusted spot and vol range. The maxima
+    are taken at reprice time on a grid spanning that range and padded by
+    envelope_margin for peaks between grid points. A full vectorized
+    reprice is due when the bound exceeds the tolerance, the spot or vol
+    move leaves the trusted range, or the anchor is older than max_age
+    seconds.
+    """
+
+    def __init__(
+        self,
+        S,
+        K,
+        T,
+        r,
+        sigma,
+        option_type="call",
+        tolerance=0.01,
+        max_spot_move=0.02,
+        max_vol_move=0.02,
+        max_age=1.0,
+        reprice_callback=None,
+        envelope_margin=1.25,
+    ):
+        """
+        :param tolerance: Largest acceptable error bound, in price units.
+        :param max_spot_move: Reprice once spot moves this fraction from the
+            anchor, where the anchor's speed stops being representative.
+        :param max_vol_move: Reprice once volatility moves this much (absolute).
+        :param max_age: Seconds before an anchor is refreshed regardless.
+        :param reprice_callback: Called with this object when a reprice is
+            due, e.g. to queue it on a worker; ticks keep being served from
+            the stale anchor until reprice() runs. Without a callback the
+            reprice happens inline during the tick.
+        :param envelope_margin: Factor applied to the sampled third-order
+            maxima.
+        """
+        self.K = np.asarray(K, dtype=float)
+        self.T = np.asarray(T, dtype=float)
+        self.r = np.asarray(r, dtype=float)
+        self.option_type = option_type
+        self.tolerance = tolerance
+        self.max_spot_move = max_spot_move
+        self.max_vol_move = max_vol_move
+        self.max_age = max_age
+        self.reprice_callback = reprice_callback
+        self.envelope_margin = envelope_margin
+        self.reprice_pending = False
+        self.ticks = 0
+        self.full_reprices = 0
+        self.reprice(S, sigma)
+
+    def reprice(self, S=None, sigma=None, T=None, now=None):
+        """
+        Full evaluation at the given (default: latest ticked) inputs; it
+        becomes the new expansion anchor.
+
+        :param T: Optional updated times to expiry in years.
+        """
+        if S is not None:
+            self.spot = np.asarray(S, dtype=float)
+        if sigma is not None:
+            self.sigma = np.asarray(sigma, dtype=float)
+        if T is not None:
+            self.T = np.asarray(T, dtype=float)
+        self.anchor_spot = self.spot
+        self.anchor_sigma = self.sigma
+        self.anchor = price_and_greeks(
+            self.spot,
+            self.K,
+            self.T,
+            self.r,
+            self.sigma,
+            self.option_type,
+            second_order=True,
+        )
+        self.envelope = self._third_order_envelope()
+        self.anchor_time = time.monotonic() if now is None else now
+        self.reprice_pending = False
+        self.full_reprices += 1
+        return {name: self.anchor[name] for name in LIVE_GREEK_NAMES}
+
+    def _third_order_envelope(self):
+        """
+        Bounds on |speed|, |zomma|, |vanna_vol| and |ultima| over the trusted
+        spot and vol range around the anchor, in one kernel call over a grid
+        of len(_ENVELOPE_STEPS)**2 points per contract.
+        """
+        spot_steps, vol_steps = np.meshgrid(_ENVELOPE_STEPS, _ENVELOPE_STEPS)
+        shape = (-1,) + (1,) * np.ndim(self.anchor["price"])
+        spot = self.anchor_spot * (
+            1.0 + self.max_spot_move * spot_steps.reshape(shape)
+        )
+        sigma = np.maximum(
+            self.anchor_sigma + self.max_vol_move * vol_steps.reshape(shape), 1e-4
+        )
+        greeks = price_and_greeks(
+            spot, self.K, self.T, self.r, sigma, self.option_type, second_order=True
+        )
+        return {
+            name: self.envelope_margin * np.abs(greeks[name]).max(axis=0)
+            for name in THIRD_ORDER_GREEK_NAMES
+        }
+
+    def tick(self, S, sigma=None, now=None):
+        """
+        Approximate values after a spot (and optionally volatility) update.
+
+        :param S: New spot, scalar or per contract.
+        :param sigma: Optional new volatilities; unchanged when omitted.
+        :return: Dict keyed by LIVE_GREEK_NAMES (vega per 1%) plus
+            "error_bound", the estimated absolute price error per contract,
+            and "exact", True when the values come from a full reprice.
+        """
+        self.ticks += 1
+        self.spot = np.asarray(S, dtype=float)
+        if sigma is not None:
+            self.sigma = np.asarray(sigma, dtype=float)
+        now = time.monotonic() if now is None else now
+
+        a = self.anchor
+        d_spot = self.spot - self.anchor_spot
+        d_vol = self.sigma - self.anchor_sigma
+        m = self.envelope
+        abs_spot, abs_vol = np.abs(d_spot), np.abs(d_vol)
+        error_bound = (
+            m["speed"] * abs_spot**3
+            + 3.0 * m["zomma"] * abs_spot**2 * abs_vol
+            + 3.0 * m["vanna_vol"] * abs_spot * abs_vol**2
+            + m["ultima"] * abs_vol**3
+        ) / 6.0
+
+        due = (
+            now - self.anchor_time > self.max_age
+            or np.any(error_bound > self.tolerance)
+            or np.any(np.abs(d_spot) > self.max_spot_move * self.anchor_spot)
+            or np.any(np.abs(d_vol) > self.max_vol_move)
+        )
+        if due and self.reprice_callback is None:
+            values = self.reprice(now=now)
+            values["error_bound"] = np.zeros_like(error_bound)
+            values["exact"] = True
+            return values
+        if due and not self.reprice_pending:
+            self.reprice_pending = True
+            self.reprice_callback(self)
+
+        raw_vega = a["vega"] * 100.0
+        return {
+            "price": a["price"]
+            + a["delta"] * d_spot
+            + 0.5 * a["gamma"] * d_spot**2
+            + raw_vega * d_vol
+            + 0.5 * a["volga"] * d_vol**2
+            + a["vanna"] * d_spot * d_vol,
+            "delta": a["delta"]
+            + a["gamma"] * d_spot
+            + 0.5 * a["speed"] * d_spot**2
+            + a["vanna"] * d_vol,
+            "gamma": a["gamma"] + a["speed"] * d_spot,
+            "vega": (raw_vega + a["vanna"] * d_spot + a["volga"] * d_vol) / 100.0,
+            "error_bound": error_bound,
+            "exact": False,
+        }
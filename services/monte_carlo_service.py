@@ -0,0 +1,229 @@
+# services/monte_carlo_service.py
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from services.black_scholes_service import _call_mask, black_scholes
+
+# z-score for the reported 95% confidence intervals
+_Z_95 = 1.959963984540054
+
+
+def european_payoff(paths, K, option_type="call"):
+    """
+    Vanilla payoff on the final simulated price.
+    """
+    if option_type == "call":
+        return np.maximum(paths[:, -1] - K, 0.0)
+    return np.maximum(K - paths[:, -1], 0.0)
+
+
+def asian_payoff(paths, K, option_type="call"):
+    """
+    Arithmetic-average-price payoff over the monitoring dates.
+    """
+    average = paths[:, 1:].mean(axis=1)
+    if option_type == "call":
+        return np.maximum(average - K, 0.0)
+    return np.maximum(K - average, 0.0)
+
+
+def barrier_payoff(paths, K, option_type="call", barrier=np.inf, knock="up-and-out"):
+    """
+    Discretely monitored single barrier payoff.
+
+    :param barrier: Barrier level.
+    :param knock: One of "up-and-out", "up-and-in", "down-and-out", "down-and-in".
+    """
+    if knock.startswith("up"):
+        touched = paths.max(axis=1) >= barrier
+    else:
+        touched = paths.min(axis=1) <= barrier
+    alive = ~touched if knock.endswith("out") else touched
+    return european_payoff(paths, K, option_type) * alive
+
+
+def _simulate_chunk(job):
+    """
+    Simulate one chunk of antithetic GBM paths and return its running sums.
+
+    Only sums are returned, so memory stays at one chunk of paths whatever
+    the total path count.
+    """
+    S, T, r, sigma, n_paths, n_steps, payoff, payoff_args, K, option_type, seed = job
+    rng = np.random.default_rng(seed)
+    half = n_paths // 2
+    dt = T / n_steps
+    shocks = rng.standard_normal((half, n_steps))
+    shocks = np.concatenate([shocks, -shocks])
+
+    log_paths = np.cumsum(
+        (r - 0.5 * sigma**2) * dt + sigma * math.sqrt(dt) * shocks, axis=1
+    )
+    paths = np.empty((2 * half, n_steps + 1))
+    paths[:, 0] = S
+    paths[:, 1:] = S * np.exp(log_paths)
+
+    discount = math.exp(-r * T)
+    # Pair each path with its antithetic twin before summing
+    y = discount * payoff(paths, K, option_type, **payoff_args)
+    x = discount * european_payoff(paths, K, option_type)
+    y = 0.5 * (y[:half] + y[half:])
+    x = 0.5 * (x[:half] + x[half:])
+    return np.array(
+        [half, y.sum(), (y * y).sum(), x.sum(), (x * x).sum(), (x * y).sum()]
+    )
+
+
+def _estimate(totals, control_price, use_control):
+    """
+    Turn accumulated sums into a price estimate and 95% confidence interval.
+    """
+    n, sy, syy, sx, sxx, sxy = totals
+    mean_y, mean_x = sy / n, sx / n
+    var_y = max(syy / n - mean_y**2, 0.0)
+    var_x = max(sxx / n - mean_x**2, 0.0)
+    cov = sxy / n - mean_x * mean_y
+    beta = cov / var_x if use_control and var_x > 0.0 else 0.0
+
+    price = mean_y - beta * (mean_x - control_price)
+    variance = max(var_y - 2.0 * beta * cov + beta * beta * var_x, 0.0)
+    stderr = math.sqrt(variance / max(n - 1, 1))
+    return {
+        "price": float(price),
+        "stderr": stderr,
+        "ci_low": float(price - _Z_95 * stderr),
+        "ci_high": float(price + _Z_95 * stderr),
+        "paths": int(2 * n),
+        "beta": float(beta),
+    }
+
+
+def monte_carlo_stream(
+    S,
+    K,
+    T,
+    r,
+    sigma,
+    option_type="call",
+    payoff=european_payoff,
+    payoff_args=None,
+    n_paths=1_000_000,
+    n_steps=252,
+    chunk_paths=20_000,
+    seed=None,
+    use_control=True,
+    processes=None,
+):
+    """
+    Price a path-dependent payoff under GBM, yielding running estimates.
+
+    Paths are simulated in fixed-size chunks of antithetic pairs, and only
+    running sums are kept, so memory is bounded by chunk_paths * n_steps
+    regardless of n_paths. The discounted vanilla payoff on the same paths is
+    used as a control variate against its closed-form Black-Scholes price.
+
+    :param S: Spot price.
+    :param K: Strike price.
+    :param T: Time to expiry in years.
+    :param r: Risk-free rate.
+    :param sigma: Volatility.
+    :param option_type: "call" or "put".
+    :param payoff: Callable (paths, K, option_type, **payoff_args) -> payoffs.
+        Must be picklable when processes is set.
+    :param payoff_args: Extra keyword arguments for the payoff, e.g.
+        {"barrier": 120.0, "knock": "up-and-out"}.
+    :param n_paths: Total number of paths (rounded down to whole chunks).
+    :param n_steps: Monitoring steps per path.
+    :param chunk_paths: Paths per chunk (an even number).
+    :param seed: Seed for reproducible results; chunk streams are spawned from
+        it so results do not depend on the number of processes.
+    :param use_control: Apply the Black-Scholes control variate.
+    :param processes: Optional number of worker processes for the chunks.
+    :return: Generator of dicts with price, stderr, ci_low, ci_high, paths and
+        beta after each chunk.
+    """
+    chunk_paths -= chunk_paths % 2
+    n_chunks = max(1, n_paths // chunk_paths)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    payoff_args = payoff_args or {}
+    jobs = (
+        (S, T, r, sigma, chunk_paths, n_steps, payoff, payoff_args, K, option_type, s)
+        for s in seeds
+    )
+    control_price = black_scholes(S, K, T, r, sigma, option_type)
+
+    totals = np.zeros(6)
+    if processes:
+        executor = ProcessPoolExecutor(max_workers=processes)
+        try:
+            for sums in executor.map(_simulate_chunk, jobs):
+                totals += sums
+                yield _estimate(totals, control_price, use_control)
+        finally:
+            # Drop queued chunks if the caller stops consuming early
+            executor.shutdown(cancel_futures=True)
+    else:
+        for job in jobs:
+            totals += _simulate_chunk(job)
+            yield _estimate(totals, control_price, use_control)
+
+
+def monte_carlo_price(*args, target_stderr=None, **kwargs):
+    """
+    Run monte_carlo_stream to completion and return its final estimate.
+
+    :param target_stderr: Stop early once the standard error drops below it.
+    """
+    estimate = None
+    for estimate in monte_carlo_stream(*args, **kwargs):
+        if target_stderr is not None and estimate["stderr"] <= target_stderr:
+            break
+    return estimate
+
+
+def monte_carlo_batch(
+    S,
+    K,
+    T,
+    r,
+    sigma,
+    option_type="call",
+    n_paths=10_000,
+    seed=None,
+    contract_ids=None,
+):
+    """
+    Vectorized Monte Carlo price of European options for arrays of contracts.
+
+    Terminal prices are drawn exactly from the GBM distribution with
+    antithetic pairs. Rows that share a contract id reuse the same normal
+    draws, which gives common random numbers across bumped scenarios.
+
+    :param n_paths: Paths per contract (an even number).
+    :param seed: Seed for the normal draws.
+    :param contract_ids: Optional integer id per row; defaults to one id per row.
+    :return: Array of option prices.
+    """
+    S, K, T, r, sigma, option_type = np.broadcast_arrays(
+        S, K, T, r, sigma, option_type
+    )
+    S, K, T, r, sigma = (
+        np.asarray(x, dtype=float).ravel() for x in (S, K, T, r, sigma)
+    )
+    sign = np.where(np.ravel(_call_mask(option_type)), 1.0, -1.0)
+    if contract_ids is None:
+        contract_ids = np.arange(S.size)
+    contract_ids = np.asarray(contract_ids)
+
+    rng = np.random.default_rng(seed)
+    half = rng.standard_normal((contract_ids.max() + 1, n_paths // 2))
+    shocks = np.concatenate([half, -half], axis=1)[contract_ids]
+
+    tau = np.maximum(T, 0.0)[:, None]
+    terminal = S[:, None] * np.exp(
+        (r[:, None] - 0.5 * sigma[:, None] ** 2) * tau
+        + sigma[:, None] * np.sqrt(tau) * shocks
+    )
+    payoff = np.maximum(sign[:, None] * (terminal - K[:, None]), 0.0)
+    return np.exp(-r * tau[:, 0]) * payoff.mean(axis=1)
@@ -0,0 +1,208 @@
+# services/out_of_core_risk.py
+
+import os
+from datetime import datetime
+import numpy as np
+from services.black_scholes_service import GREEK_NAMES, calculate_greeks_batch
+
+INPUT_COLUMNS = ("spot", "strike", "expiry", "rate", "sigma", "is_call")
+_COLUMN_DTYPES = {"is_call": np.bool_}
+
+DEFAULT_BLOCK_ROWS = 1_000_000
+
+
+def _column_path(directory, name):
+    return os.path.join(directory, f"{name}.npy")
+
+
+def _read_header(path):
+    """
+    :return: Tuple of (shape, dtype, header size in bytes) of a .npy file.
+    """
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+        return shape, dtype, f.tell()
+
+
+def _open_block(path, start, stop, mode):
+    """
+    Map rows [start, stop) of a 1-D .npy file.
+
+    Each block gets its own short-lived mapping, so pages from earlier blocks
+    are released when the block is done and resident memory stays at roughly
+    one block per column.
+    """
+    _, dtype, header_size = _read_header(path)
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode=mode,
+        offset=header_size + start * dtype.itemsize,
+        shape=(stop - start,),
+    )
+
+
+def create_columns(directory, names, n_rows, dtype=np.float64):
+    """
+    Create empty memory-mapped .npy columns on disk.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name in names:
+        column = np.lib.format.open_memmap(
+            _column_path(directory, name),
+            mode="w+",
+            dtype=_COLUMN_DTYPES.get(name, dtype),
+            shape=(n_rows,),
+        )
+        del column
+
+
+def build_contract_store(directory, n_rows, blocks):
+    """
+    Lay contract inputs out as memory-mapped columns, one block at a time.
+
+    :param directory: Directory that will hold one .npy file per column.
+    :param n_rows: Total number of contracts.
+    :param blocks: Iterable of dicts of equal-length arrays keyed by
+        INPUT_COLUMNS (expiry in years). Blocks are written in order.
+    :return: Number of rows written.
+    """
+    create_columns(directory, INPUT_COLUMNS, n_rows)
+    start = 0
+    for block in blocks:
+        stop = start + len(block["spot"])
+        if stop > n_rows:
+            raise ValueError(f"Blocks hold more than the declared {n_rows} rows.")
+        for name in INPUT_COLUMNS:
+            column = _open_block(_column_path(directory, name), start, stop, "r+")
+            column[:] = block[name]
+            column.flush()
+            del column
+        start = stop
+    return start
+
+
+def run_chain_risk(
+    directory, block_rows=DEFAULT_BLOCK_ROWS, rate=None, output_dir=None
+):
+    """
+    Stream a contract store through the batch Greeks kernel.
+
+    Inputs are read and results written block by block through memory maps,
+    so each byte is touched once and peak memory is bounded by block_rows.
+
+    :param directory: Directory created by build_contract_store.
+    :param block_rows: Rows per block.
+    :param rate: Optional flat rate overriding the stored rate column, e.g.
+        to re-run after a rate change.
+    :param output_dir: Where to write one .npy per GREEK_NAMES entry;
+        defaults to directory.
+    :return: Number of rows processed.
+    """
+    output_dir = output_dir or directory
+    n_rows = _read_header(_column_path(directory, "spot"))[0][0]
+    create_columns(output_dir, GREEK_NAMES, n_rows)
+
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        inputs = {
+            name: _open_block(_column_path(directory, name), start, stop, "r")
+            for name in INPUT_COLUMNS
+            if not (name == "rate" and rate is not None)
+        }
+        outputs = {
+            name: _open_block(_column_path(output_dir, name), start, stop, "r+")
+            for name in GREEK_NAMES
+        }
+        calculate_greeks_batch(
+            inputs["spot"],
+            inputs["strike"],
+            inputs["expiry"],
+            inputs["rate"] if rate is None else rate,
+            inputs["sigma"],
+            inputs["is_call"],
+            out=outputs,
+        )
+        for column in outputs.values():
+            column.flush()
+        del inputs, outputs
+    return n_rows
+
+
+def load_results(directory):
+    """
+    Open the result columns read-only.
+
+    :return: Dict of memory-mapped arrays keyed by GREEK_NAMES.
+    """
+    return {
+        name: np.load(_column_path(directory, name), mmap_mode="r")
+        for name in GREEK_NAMES
+    }
+
+
+def parse_occ_symbols(symbols):
+    """
+    Split OCC option symbols (e.g. "AAPL240119C00150000"), as stored in
+    OptionData.ticker, into expiry dates, call flags and strikes.
+
+    :return: Tuple of (expiry datetimes, is_call bool array, strike array).
+    """
+    tails = [str(symbol)[-15:] for symbol in symbols]
+    expiries = np.array([datetime.strptime(tail[:6], "%y%m%d") for tail in tails])
+    is_call = np.array([tail[6] == "C" for tail in tails], dtype=bool)
+    strikes = np.array([tail[7:] for tail in tails], dtype=float) / 1000.0
+    return expiries, is_call, strikes
+
+
+def option_data_contract_blocks(session, block_rows=100_000):
+    """
+    Stream strike, expiry, call flag and volatility columns for every
+    OptionData row.
+
+    Rows are fetched as plain column tuples rather than ORM objects. Expiry is
+    measured in years from each row's snapshot date, and sigma is the stored
+    implied volatility (NaN where it was never recorded). OptionData does not
+    store spot or rate, so callers add "spot" and "rate" from their market
+    data before passing blocks to build_contract_store.
+
+    :param session: SQLAlchemy session.
+    :param block_rows: Rows per yielded block.
+    :return: Generator of dicts with "strike", "expiry", "is_call" and
+        "sigma" arrays.
+    """
+    from models.models import OptionData
+
+    query = (
+        session.query(OptionData.ticker, OptionData.date, OptionData.iv)
+        .order_by(OptionData.id)
+        .yield_per(block_rows)
+    )
+    rows = []
+    for row in query:
+        rows.append(row)
+        if len(rows) == block_rows:
+            yield _contract_block(rows)
+            rows = []
+    if rows:
+        yield _contract_block(rows)
+
+
+def _contract_block(rows):
+    symbols, dates, ivs = zip(*rows)
+    expiries, is_call, strikes = parse_occ_symbols(symbols)
+    days = [
+        (expiry - date.replace(tzinfo=None)).days
+        for expiry, date in zip(expiries, dates)
+    ]
+    years = np.array(days, dtype=float) / 365.0
+    return {
+        "strike": strikes,
+        "expiry": years,
+        "is_call": is_call,
+        "sigma": np.array(ivs, dtype=float),
+    }
@@ -0,0 +1,189 @@
+# services/parallel_pricing.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from services.black_scholes_service import (
+    GREEK_NAMES,
+    calculate_greeks_batch,
+    implied_volatility_batch,
+)
+
+IV_OUTPUTS = ("iv", "converged")
+
+
+def _views(block, n_columns, n_rows):
+    return np.ndarray((n_columns, n_rows), dtype=np.float64, buffer=block.buf)
+
+
+def _greeks_worker(input_name, output_name, n_rows, start, stop):
+    inputs_block = shared_memory.SharedMemory(name=input_name)
+    outputs_block = shared_memory.SharedMemory(name=output_name)
+    try:
+        S, K, T, r, sigma, is_call = _views(inputs_block, 6, n_rows)[:, start:stop]
+        outputs = _views(outputs_block, len(GREEK_NAMES), n_rows)[:, start:stop]
+        calculate_greeks_batch(
+            S, K, T, r, sigma, is_call > 0.5, out=dict(zip(GREEK_NAMES, outputs))
+        )
+        del S, K, T, r, sigma, is_call, outputs
+    finally:
+        inputs_block.close()
+        outputs_block.close()
+
+
+def _iv_worker(input_name, output_name, n_rows, start, stop, kwargs):
+    inputs_block = shared_memory.SharedMemory(name=input_name)
+    outputs_block = shared_memory.SharedMemory(name=output_name)
+    try:
+        price, S, K, T, r, is_call, warm = _views(inputs_block, 7, n_rows)[
+            :, start:stop
+        ]
+        outputs = _views(outputs_block, len(IV_OUTPUTS), n_rows)[:, start:stop]
+        iv, converged = implied_volatility_batch(
+            price, S, K, T, r, is_call > 0.5, initial_sigma=warm, **kwargs
+        )
+        outputs[0] = iv
+        outputs[1] = converged
+        del price, S, K, T, r, is_call, warm, outputs
+    finally:
+        inputs_block.close()
+        outputs_block.close()
+
+
+def _flatten(*args):
+    """
+    Broadcast the inputs and flatten them to 1-D columns; the option type
+    column (second to last or last) becomes a boolean call mask.
+    """
+    arrays = [np.ravel(x) for x in np.broadcast_arrays(*args)]
+    columns = []
+    for array in arrays:
+        if array.dtype.kind in "US":
+            columns.append(array == "call")
+        elif array.dtype == bool:
+            columns.append(array)
+        else:
+            columns.append(array.astype(float))
+    return columns
+
+
+class SharedMemoryPricer:
+    """
+    Runs the Greeks and implied volatility kernels across a persistent
+    process pool.
+
+    Input columns are copied once into a shared memory block and workers are
+    handed index ranges; each worker writes its slice of the results into a
+    shared output block, so nothing but the block names crosses the process
+    boundary. Batches smaller than min_parallel_rows, or a single-process
+    configuration, run in-process, where the copy and dispatch overhead would
+    outweigh any gain.
+    """
+
+    def __init__(
+        self, processes=None, min_parallel_rows=100_000, chunks_per_process=4
+    ):
+        """
+        :param processes: Worker count; defaults to os.cpu_count().
+        :param min_parallel_rows: Smaller batches are priced in-process.
+        :param chunks_per_process: Index ranges per worker, for load balancing.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.min_parallel_rows = min_parallel_rows
+        self.chunks_per_process = chunks_per_process
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _parallel(self, n_rows):
+        return self.processes > 1 and n_rows >= self.min_parallel_rows
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        return self._executor
+
+    def _run(self, worker, columns, n_outputs, *extra):
+        """
+        Copy columns into shared memory, fan out index ranges, collect results.
+        """
+        n_rows = len(columns[0])
+        inputs_block = shared_memory.SharedMemory(
+            create=True, size=max(1, len(columns) * n_rows * 8)
+        )
+        outputs_block = shared_memory.SharedMemory(
+            create=True, size=max(1, n_outputs * n_rows * 8)
+        )
+        try:
+            inputs = _views(inputs_block, len(columns), n_rows)
+            for row, column in enumerate(columns):
+                inputs[row] = column
+            bounds = np.linspace(
+                0, n_rows, self.processes * self.chunks_per_process + 1, dtype=int
+            )
+            futures = [
+                self._pool().submit(
+                    worker,
+                    inputs_block.name,
+                    outputs_block.name,
+                    n_rows,
+                    start,
+                    stop,
+                    *extra,
+                )
+                for start, stop in zip(bounds[:-1], bounds[1:])
+                if stop > start
+            ]
+            for future in futures:
+                future.result()
+            results = _views(outputs_block, n_outputs, n_rows).copy()
+            del inputs
+            return results
+        finally:
+            inputs_block.close()
+            inputs_block.unlink()
+            outputs_block.close()
+            outputs_block.unlink()
+
+    def calculate_greeks(self, S, K, T, r, sigma, option_type="call"):
+        """
+        Parallel equivalent of calculate_greeks_batch for 1-D inputs.
+
+        :return: Dict of arrays keyed by GREEK_NAMES.
+        """
+        columns = _flatten(S, K, T, r, sigma, option_type)
+        if not self._parallel(len(columns[0])):
+            return calculate_greeks_batch(*columns)
+
+        columns[-1] = columns[-1].astype(float)
+        results = self._run(_greeks_worker, columns, len(GREEK_NAMES))
+        return dict(zip(GREEK_NAMES, results))
+
+    def implied_volatility(
+        self, price, S, K, T, r, option_type="call", initial_sigma=np.nan, **kwargs
+    ):
+        """
+        Parallel equivalent of implied_volatility_batch for 1-D inputs.
+
+        :param kwargs: Solver options forwarded to implied_volatility_batch.
+        :return: Tuple of (implied volatilities, converged flags).
+        """
+        columns = _flatten(price, S, K, T, r, option_type, initial_sigma)
+        if not self._parallel(len(columns[0])):
+            return implied_volatility_batch(
+                *columns[:6], initial_sigma=columns[6], **kwargs
+            )
+
+        columns[5] = columns[5].astype(float)
+        iv, converged = self._run(_iv_worker, columns, len(IV_OUTPUTS), kwargs)
+        return iv, converged > 0.5
@@ -0,0 +1,202 @@
+# services/pnl_attribution.py
+
+import numpy as np
+
+ATTRIBUTION_NAMES = ("delta", "gamma", "theta", "vega", "unexplained", "total")
+
+# Days are packed below the underlying id to give one sortable int64 key
+_DAY_BITS = 32
+
+
+def _day_numbers(dates):
+    """
+    :return: Days since the epoch as int64, ignoring any tzinfo.
+    """
+    naive = [d.replace(tzinfo=None) for d in dates]
+    return np.array(naive, dtype="datetime64[D]").astype(np.int64)
+
+
+def _last_per_key(keys, *columns):
+    """
+    Keep the last row of each run of equal keys; keys must be sorted.
+    """
+    last = np.ones(len(keys), dtype=bool)
+    last[:-1] = keys[1:] != keys[:-1]
+    return (keys[last],) + tuple(column[last] for column in columns)
+
+
+def attribute_pnl_arrays(
+    contract_ids,
+    days,
+    price,
+    iv,
+    delta,
+    gamma,
+    theta,
+    vega,
+    underlying_ids,
+    sizes,
+    close_keys,
+    closes,
+):
+    """
+    Split day-over-day option P&L into Greek components in one pass.
+
+    Rows must be sorted by (contract_ids, days) with one snapshot per contract
+    and day. Each day's move is explained with the previous snapshot's Greeks:
+    delta * dS + 0.5 * gamma * dS**2 + theta * dt + vega * d(IV in points),
+    with theta per year and vega per 1% as produced by the Greeks kernels. The
+    remainder of the observed price change is "unexplained".
+
+    :param contract_ids: Integer contract id per snapshot row.
+    :param days: Snapshot day (days since the epoch) per row.
+    :param underlying_ids: Integer underlying id per row.
+    :param sizes: Position size (quantity * multiplier) per row.
+    :param close_keys: Sorted (underlying_id << 32 | day) keys of daily closes.
+    :param closes: Underlying close per key.
+    :return: Dict with "row" (index of the later snapshot of each pair) and
+        position-scaled arrays keyed by ATTRIBUTION_NAMES. Components whose
+        inputs are missing (no close, no IV or no price) are NaN.
+    """
+    keys = (underlying_ids.astype(np.int64) << _DAY_BITS) | days
+    positions = np.searchsorted(close_keys, keys)
+    found = positions < len(close_keys)
+    found[found] = close_keys[positions[found]] == keys[found]
+    spot = np.where(found, closes[np.minimum(positions, len(closes) - 1)], np.nan)
+
+    prev = np.flatnonzero(contract_ids[1:] == contract_ids[:-1])
+    cur = prev + 1
+    d_spot = spot[cur] - spot[prev]
+    d_time = (days[cur] - days[prev]) / 365.0
+    d_vol = (iv[cur] - iv[prev]) * 100.0
+    size = sizes[cur]
+
+    result = {
+        "row": cur,
+        "delta": size * delta[prev] * d_spot,
+        "gamma": size * 0.5 * gamma[prev] * d_spot**2,
+        "theta": size * theta[prev] * d_time,
+        "vega": size * vega[prev] * d_vol,
+        "total": size * (price[cur] - price[prev]),
+    }
+    result["unexplained"] = result["total"] - (
+        result["delta"] + result["gamma"] + result["theta"] + result["vega"]
+    )
+    return result
+
+
+def attribute_pnl(session, start=None, end=None, tickers=None):
+    """
+    Daily Greek P&L attribution for every stored position.
+
+    OptionData, AggregateData and Position are read with column queries
+    rather than ORM objects, and all contracts and dates are attributed in a
+    single vectorized pass over the resulting arrays. When a contract has
+    several snapshots on one day the latest is used; underlying closes are
+    taken from the 1-day bars and matched by calendar day.
+
+    :param session: SQLAlchemy session.
+    :param start: Optional earliest snapshot datetime.
+    :param end: Optional latest snapshot datetime.
+    :param tickers: Optional contract symbols to restrict the report to.
+    :return: Dict of arrays: "ticker", "underlying", "date" (datetime64[D] of
+        the later snapshot) and position-scaled ATTRIBUTION_NAMES.
+    """
+    from models.models import AggregateData, OptionData, Position
+
+    position_query = session.query(
+        Position.ticker, Position.underlying, Position.quantity, Position.multiplier
+    )
+    if tickers is not None:
+        position_query = position_query.filter(Position.ticker.in_(list(tickers)))
+    size_of, underlying_of = {}, {}
+    for ticker, underlying, quantity, multiplier in position_query.all():
+        size_of[ticker] = size_of.get(ticker, 0.0) + quantity * (multiplier or 100.0)
+        underlying_of[ticker] = underlying
+
+    empty = {name: np.empty(0) for name in ATTRIBUTION_NAMES}
+    empty.update(
+        ticker=np.empty(0, dtype=object),
+        underlying=np.empty(0, dtype=object),
+        date=np.empty(0, dtype="datetime64[D]"),
+    )
+    if not size_of:
+        return empty
+
+    option_query = session.query(
+        OptionData.ticker,
+        OptionData.date,
+        OptionData.price,
+        OptionData.iv,
+        OptionData.delta,
+        OptionData.gamma,
+        OptionData.theta,
+        OptionData.vega,
+    ).filter(OptionData.ticker.in_(list(size_of)))
+    underlyings = sorted(set(underlying_of.values()))
+    close_query = session.query(
+        AggregateData.ticker, AggregateData.date, AggregateData.close
+    ).filter(
+        AggregateData.ticker.in_(underlyings),
+        AggregateData.multiplier == 1,
+        AggregateData.timespan == "day",
+    )
+    if start is not None:
+        option_query = option_query.filter(OptionData.date >= start)
+        close_query = close_query.filter(AggregateData.date >= start)
+    if end is not None:
+        option_query = option_query.filter(OptionData.date <= end)
+        close_query = close_query.filter(AggregateData.date <= end)
+
+    option_rows = option_query.order_by(OptionData.ticker, OptionData.date).all()
+    close_rows = close_query.order_by(AggregateData.ticker, AggregateData.date).all()
+    if not option_rows or not close_rows:
+        return empty
+
+    underlying_index = {underlying: i for i, underlying in enumerate(underlyings)}
+    symbols, dates, *values = zip(*option_rows)
+    contract_symbols = sorted(set(symbols))
+    contract_index = {symbol: i for i, symbol in enumerate(contract_symbols)}
+    contract_ids = np.array([contract_index[s] for s in symbols], dtype=np.int64)
+    values = [np.array(column, dtype=float) for column in values]
+
+    # One snapshot per contract and day: the last one
+    snapshot_keys = (contract_ids << _DAY_BITS) | _day_numbers(dates)
+    order = np.argsort(snapshot_keys, kind="stable")
+    snapshot_keys, *values = _last_per_key(
+        snapshot_keys[order], *(column[order] for column in values)
+    )
+    contract_ids = snapshot_keys >> _DAY_BITS
+    days = snapshot_keys & ((1 << _DAY_BITS) - 1)
+    contract_underlying = np.array(
+        [underlying_index[underlying_of[s]] for s in contract_symbols], dtype=np.int64
+    )
+    contract_size = np.array([size_of[s] for s in contract_symbols])
+
+    close_tickers, close_dates, close_values = zip(*close_rows)
+    close_keys = (
+        np.array([underlying_index[t] for t in close_tickers], dtype=np.int64)
+        << _DAY_BITS
+    ) | _day_numbers(close_dates)
+    order = np.argsort(close_keys, kind="stable")
+    close_keys, closes = _last_per_key(
+        close_keys[order], np.array(close_values, dtype=float)[order]
+    )
+
+    result = attribute_pnl_arrays(
+        contract_ids,
+        days,
+        *values,
+        contract_underlying[contract_ids],
+        contract_size[contract_ids],
+        close_keys,
+        closes,
+    )
+    rows = result.pop("row")
+    contract_symbols = np.array(contract_symbols, dtype=object)
+    result["ticker"] = contract_symbols[contract_ids[rows]]
+    result["underlying"] = np.array(underlyings, dtype=object)[
+        contract_underlying[contract_ids[rows]]
+    ]
+    result["date"] = days[rows].astype("datetime64[D]")
+    return result
@@ -0,0 +1,238 @@
+# services/portfolio_service.py
+
+from datetime import datetime
+import numpy as np
+from services.black_scholes_service import GREEK_NAMES, calculate_greeks_batch
+
+
+class PortfolioGreeks:
+    """
+    Running net Greeks for a book of option legs.
+
+    Legs are held in columnar arrays together with their last position-scaled
+    price and Greeks. Spot and IV updates reprice only the affected legs and
+    apply the change to per-underlying and per-(underlying, expiry) totals
+    instead of re-summing the whole book.
+    """
+
+    def __init__(self, rate: float = 0.01):
+        """
+        :param rate: Risk-free rate used for every leg.
+        """
+        self.rate = rate
+        self.underlyings = []
+        self.spots = np.empty(0)
+        self.groups = []
+        self.tickers = np.empty(0, dtype=object)
+        self._underlying_index = {}
+        self._group_index = {}
+        self._leg_index = {}
+        self._underlying = np.empty(0, dtype=np.int64)
+        self._group = np.empty(0, dtype=np.int64)
+        self._strike = np.empty(0)
+        self._expiry = np.empty(0)
+        self._is_call = np.empty(0, dtype=bool)
+        self._sigma = np.empty(0)
+        self._size = np.empty(0)
+        self._contrib = np.empty((0, len(GREEK_NAMES)))
+        self._legs_by_underlying = []
+        self.underlying_totals = np.empty((0, len(GREEK_NAMES)))
+        self.group_totals = np.empty((0, len(GREEK_NAMES)))
+
+    @classmethod
+    def from_positions(cls, positions, spots, ivs, rate=0.01, as_of=None):
+        """
+        Build the book from Position rows.
+
+        :param positions: Iterable of models.models.Position.
+        :param spots: Dict of underlying -> spot price.
+        :param ivs: Dict of contract symbol -> implied volatility.
+        :param as_of: Valuation time; defaults to now (UTC).
+        """
+        as_of = as_of or datetime.utcnow()
+        positions = list(positions)
+        book = cls(rate)
+        book.set_spots(spots)
+        book.add_legs(
+            tickers=[p.ticker for p in positions],
+            underlyings=[p.underlying for p in positions],
+            strikes=[p.strike for p in positions],
+            expiries=[(p.expiration - as_of).days / 365.0 for p in positions],
+            option_types=[p.option_type for p in positions],
+            sigmas=[ivs[p.ticker] for p in positions],
+            quantities=[p.quantity * (p.multiplier or 100.0) for p in positions],
+        )
+        return book
+
+    def set_spots(self, spots):
+        """
+        Register underlyings and their spot prices without repricing.
+        """
+        for underlying, spot in spots.items():
+            self._underlying_id(underlying)
+            self.spots[self._underlying_index[underlying]] = spot
+
+    def _underlying_id(self, underlying):
+        if underlying not in self._underlying_index:
+            self._underlying_index[underlying] = len(self.underlyings)
+            self.underlyings.append(underlying)
+            self.spots = np.append(self.spots, np.nan)
+            self.underlying_totals = np.vstack(
+                [self.underlying_totals, np.zeros(len(GREEK_NAMES))]
+            )
+            self._legs_by_underlying.append(np.empty(0, dtype=np.int64))
+        return self._underlying_index[underlying]
+
+    def _group_id(self, underlying, expiry):
+        key = (underlying, round(float(expiry), 6))
+        if key not in self._group_index:
+            self._group_index[key] = len(self.groups)
+            self.groups.append(key)
+            self.group_totals = np.vstack(
+                [self.group_totals, np.zeros(len(GREEK_NAMES))]
+            )
+        return self._group_index[key]
+
+    def add_legs(
+        self, tickers, underlyings, strikes, expiries, option_types, sigmas, quantities
+    ):
+        """
+        Add legs in bulk, price them and fold them into the totals.
+
+        :param expiries: Time to expiry in years.
+        :param quantities: Position size including the contract multiplier.
+        """
+        start = len(self._strike)
+        underlying_ids = np.array(
+            [self._underlying_id(u) for u in underlyings], dtype=np.int64
+        )
+        group_ids = np.array(
+            [self._group_id(u, t) for u, t in zip(underlyings, expiries)],
+            dtype=np.int64,
+        )
+        self.tickers = np.append(self.tickers, np.array(tickers, dtype=object))
+        # A contract can be held in several legs (one Position row per trade)
+        for offset, ticker in enumerate(tickers):
+            self._leg_index[ticker] = np.append(
+                self._leg_index.get(ticker, np.empty(0, dtype=np.int64)),
+                start + offset,
+            )
+        self._underlying = np.append(self._underlying, underlying_ids)
+        self._group = np.append(self._group, group_ids)
+        self._strike = np.append(self._strike, np.asarray(strikes, dtype=float))
+        self._expiry = np.append(self._expiry, np.asarray(expiries, dtype=float))
+        self._is_call = np.append(
+            self._is_call, np.asarray(option_types) == "call"
+        )
+        self._sigma = np.append(self._sigma, np.asarray(sigmas, dtype=float))
+        self._size = np.append(self._size, np.asarray(quantities, dtype=float))
+        self._contrib = np.vstack(
+            [self._contrib, np.zeros((len(underlying_ids), len(GREEK_NAMES)))]
+        )
+
+        for underlying in np.unique(underlying_ids):
+            new_legs = start + np.flatnonzero(underlying_ids == underlying)
+            self._legs_by_underlying[underlying] = np.concatenate(
+                [self._legs_by_underlying[underlying], new_legs]
+            )
+        self._reprice(np.arange(start, len(self._strike)))
+
+    def _reprice(self, legs):
+        """
+        Reprice the given legs and apply the change to the running totals.
+        """
+        if len(legs) == 0:
+            return
+        greeks = calculate_greeks_batch(
+            self.spots[self._underlying[legs]],
+            self._strike[legs],
+            self._expiry[legs],
+            self.rate,
+            self._sigma[legs],
+            self._is_call[legs],
+        )
+        contrib = np.column_stack([greeks[name] for name in GREEK_NAMES])
+        contrib *= self._size[legs, None]
+        change = contrib - self._contrib[legs]
+        self._contrib[legs] = contrib
+        np.add.at(self.underlying_totals, self._underlying[legs], change)
+        np.add.at(self.group_totals, self._group[legs], change)
+
+    def update_spot(self, underlying, spot):
+        """
+        Move one underlying's spot and reprice only its legs.
+        """
+        index = self._underlying_id(underlying)
+        self.spots[index] = spot
+        self._reprice(self._legs_by_underlying[index])
+
+    def update_ivs(self, ivs):
+        """
+        Apply new implied volatilities and reprice only those legs.
+
+        :param ivs: Dict of contract symbol -> implied volatility, applied to
+            every leg in that contract. Unknown symbols are ignored.
+        """
+        pairs = [
+            (self._leg_index[ticker], sigma)
+            for ticker, sigma in ivs.items()
+            if ticker in self._leg_index
+        ]
+        if not pairs:
+            return
+        legs = np.concatenate([rows for rows, _ in pairs])
+        sigmas = np.concatenate([np.full(len(rows), sigma) for rows, sigma in pairs])
+        self._sigma[legs] = sigmas
+        self._reprice(legs)
+
+    def net_greeks(self, underlying=None, expiry=None):
+        """
+        Net position-scaled price and Greeks.
+
+        :param underlying: Restrict to one underlying.
+        :param expiry: With underlying, restrict to one expiry (in years, as
+            passed to add_legs).
+        :return: Dict keyed by GREEK_NAMES ("price" is the position value).
+        """
+        if underlying is None:
+            totals = self.underlying_totals.sum(axis=0)
+        elif expiry is None:
+            totals = self.underlying_totals[self._underlying_index[underlying]]
+        else:
+            key = (underlying, round(float(expiry), 6))
+            totals = self.group_totals[self._group_index[key]]
+        return dict(zip(GREEK_NAMES, totals.tolist()))
+
+    def resync(self):
+        """
+        Recompute the totals from the per-leg contributions, clearing any
+        floating-point drift accumulated by incremental updates.
+        """
+        self.underlying_totals[:] = 0.0
+        self.group_totals[:] = 0.0
+        np.add.at(self.underlying_totals, self._underlying, self._contrib)
+        np.add.at(self.group_totals, self._group, self._contrib)
+
+    def to_option_data(self, date=None):
+        """
+        Per-contract (unscaled) Greeks as OptionData rows for persistence.
+        """
+        from models.models import OptionData
+
+        date = date or datetime.utcnow()
+        per_contract = self._contrib / np.where(self._size != 0.0, self._size, 1.0)[
+            :, None
+        ]
+        columns = dict(zip(GREEK_NAMES, per_contract.T))
+        return [
+            OptionData(
+                ticker=ticker,
+                date=date,
+                delta=float(columns["delta"][i]),
+                gamma=float(columns["gamma"][i]),
+                theta=float(columns["theta"][i]),
+                vega=float(columns["vega"][i]),
+                rho=float(columns["rho"][i]),
+            )
+            for i, ticker in enumerate(self.tickers)
+        ]
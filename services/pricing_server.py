@@ -0,0 +1,317 @@
+# services/pricing_server.py
+
+"""
+Local Black-Scholes pricing service with request micro-batching.
+
+Concurrent requests arriving within a short window are coalesced into one
+calculate_greeks_batch call and the results are split back per caller.
+Run with:
+
+    python -m services.pricing_server --port 8765
+    python -m services.pricing_server --unix-socket /tmp/pricing.sock
+
+POST /price with a JSON body of S, K, T, r, sigma and option_type (scalars or
+equal-length lists) returns the price and Greeks as lists, or 503 when the
+batch is not priced within the request timeout or the service is stopping.
+GET /metrics returns queue depth and batch size statistics.
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from services.black_scholes_service import GREEK_NAMES, calculate_greeks_batch
+
+PRICING_FIELDS = ("S", "K", "T", "r", "sigma", "option_type")
+
+
+class BatcherStopped(RuntimeError):
+    """
+    Raised for requests a stopped MicroBatcher will never price.
+    """
+
+
+class MicroBatcher:
+    """
+    Coalesces pricing requests from many threads into single kernel calls.
+    """
+
+    def __init__(
+        self, kernel=calculate_greeks_batch, window=0.002, max_rows=200_000
+    ):
+        """
+        :param kernel: Vectorized pricer returning a dict of arrays.
+        :param window: Seconds to wait for more requests after the first one.
+        :param max_rows: Flush early once a batch holds this many rows.
+        """
+        self.kernel = kernel
+        self.window = window
+        self.max_rows = max_rows
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.rows = 0
+        self.last_batch_requests = 0
+        self.max_batch_requests = 0
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the batching thread and fail every request still queued with
+        BatcherStopped. Later submits fail immediately.
+        """
+        with self._lock:
+            self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.set_exception(BatcherStopped("Pricing service stopped."))
+
+    def submit(self, payload) -> Future:
+        """
+        Queue one request.
+
+        :param payload: Dict keyed by PRICING_FIELDS; values are scalars or
+            equal-length sequences.
+        :return: Future resolving to a dict of arrays keyed by GREEK_NAMES.
+        :raises ValueError: If a field is nested, lengths differ or an
+            option_type is not "call" or "put".
+        """
+        columns = [
+            np.atleast_1d(np.asarray(payload[name], dtype=float))
+            for name in PRICING_FIELDS[:5]
+        ]
+        option_type = np.atleast_1d(np.asarray(payload.get("option_type", "call")))
+        for name, column in zip(PRICING_FIELDS, columns + [option_type]):
+            if column.ndim > 1:
+                raise ValueError(f"{name} must be a scalar or a flat list")
+        unknown = set(option_type.tolist()) - {"call", "put"}
+        if unknown:
+            raise ValueError(f"Unknown option_type: {sorted(map(str, unknown))}")
+        inputs = np.broadcast_arrays(*columns, option_type == "call")
+        future = Future()
+        with self._lock:
+            if self._stopped.is_set():
+                future.set_exception(BatcherStopped("Pricing service stopped."))
+            else:
+                self._queue.put((inputs, future))
+        return future
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "requests": self.requests,
+                "batches": self.batches,
+                "rows": self.rows,
+                "mean_batch_requests": self.requests / self.batches
+                if self.batches
+                else 0.0,
+                "last_batch_requests": self.last_batch_requests,
+                "max_batch_requests": self.max_batch_requests,
+            }
+
+    def _collect(self):
+        """
+        Block for the first request, then gather more until the window closes.
+        """
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        rows = len(batch[0][0][0])
+        deadline = time.monotonic() + self.window
+        while rows < self.max_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            rows += len(item[0][0])
+        return batch
+
+    def _price(self, batch):
+        """
+        Price a batch in one kernel call and resolve its futures.
+
+        :return: Number of rows priced.
+        """
+        sizes = [len(inputs[0]) for inputs, _ in batch]
+        columns = [
+            np.concatenate([inputs[i] for inputs, _ in batch])
+            for i in range(len(PRICING_FIELDS))
+        ]
+        results = self.kernel(*columns)
+        offsets = np.cumsum([0] + sizes)
+        splits = [
+            {name: results[name][start:stop] for name in GREEK_NAMES}
+            for start, stop in zip(offsets[:-1], offsets[1:])
+        ]
+        for (_, future), split in zip(batch, splits):
+            future.set_result(split)
+        return int(offsets[-1])
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            try:
+                rows = self._price(batch)
+            except Exception as e:
+                logging.error(f"Pricing batch failed: {e}")
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                # Price each request alone so only the bad ones fail
+                rows = 0
+                for item in batch:
+                    try:
+                        rows += self._price([item])
+                    except Exception as e:
+                        item[1].set_exception(e)
+
+            with self._lock:
+                self.requests += len(batch)
+                self.batches += 1
+                self.rows += rows
+                self.last_batch_requests = len(batch)
+                self.max_batch_requests = max(self.max_batch_requests, len(batch))
+
+
+class PricingRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP front end for the MicroBatcher attached to the server.
+    """
+
+    def do_GET(self):
+        if self.path != "/metrics":
+            self._send(404, {"error": "Not found"})
+            return
+        self._send(200, self.server.batcher.metrics())
+
+    def do_POST(self):
+        if self.path != "/price":
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length))
+            results = self.server.batcher.submit(payload).result(
+                timeout=self.server.request_timeout
+            )
+        except FutureTimeoutError:
+            self._send(503, {"error": "Pricing timed out"})
+            return
+        except BatcherStopped as e:
+            self._send(503, {"error": str(e)})
+            return
+        except (KeyError, ValueError) as e:
+            self._send(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+            return
+        self._send(200, {name: value.tolist() for name, value in results.items()})
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+
+class PricingHTTPServer(ThreadingHTTPServer):
+    # Many clients connect at once; the default backlog of 5 resets them
+    request_queue_size = 256
+
+
+class ThreadingUnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def create_server(
+    host="127.0.0.1", port=8765, unix_socket=None, window=0.002, request_timeout=5.0
+):
+    """
+    Build a pricing server with a running MicroBatcher.
+
+    :param unix_socket: Serve on this Unix socket path instead of TCP.
+    :param request_timeout: Seconds a request waits for its batch before the
+        handler answers 503.
+    :return: Server instance; call serve_forever() to run it.
+    """
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = ThreadingUnixHTTPServer(unix_socket, PricingRequestHandler)
+    else:
+        server = PricingHTTPServer((host, port), PricingRequestHandler)
+    server.batcher = MicroBatcher(window=window).start()
+    server.request_timeout = request_timeout
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket")
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--request-timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = create_server(
+        args.host,
+        args.port,
+        args.unix_socket,
+        window=args.window_ms / 1000.0,
+        request_timeout=args.request_timeout,
+    )
+    logging.info(f"Pricing service listening on {args.unix_socket or args.port}.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.batcher.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# services/stress_service.py
+
+import numpy as np
+from services.black_scholes_service import black_scholes_batch
+
+# Rough number of grid-sized float64 temporaries the batch pricer allocates,
+# used to turn the memory cap into a contract chunk size.
+_PRICER_TEMPORARIES = 16
+
+DEFAULT_SPOT_SHOCKS = np.linspace(-0.2, 0.2, 21)
+DEFAULT_VOL_SHOCKS = np.linspace(-0.1, 0.1, 21)
+
+
+def stress_chunk_size(n_spot, n_vol, max_memory_bytes):
+    """
+    Number of contracts that can be repriced across the grid in one pass
+    without the pricer's temporaries exceeding max_memory_bytes.
+    """
+    per_contract = n_spot * n_vol * 8 * _PRICER_TEMPORARIES
+    return max(1, int(max_memory_bytes // per_contract))
+
+
+def stress_grid(
+    S,
+    K,
+    T,
+    r,
+    sigma,
+    option_type="call",
+    quantity=1.0,
+    spot_shocks=DEFAULT_SPOT_SHOCKS,
+    vol_shocks=DEFAULT_VOL_SHOCKS,
+    days_forward=0.0,
+    aggregate=False,
+    max_memory_bytes=256 * 1024**2,
+    out=None,
+):
+    """
+    Reprice contracts across a spot shock x vol shock grid.
+
+    Each contract chunk is priced in one broadcast call of shape
+    (n_spot, n_vol, chunk); chunks are sized so the pricer's temporaries stay
+    under max_memory_bytes regardless of grid or book size.
+
+    :param S: Spot prices.
+    :param K: Strike prices.
+    :param T: Times to expiry in years.
+    :param r: Risk-free rates.
+    :param sigma: Volatilities.
+    :param option_type: "call"/"put", an array of those, or a boolean call mask.
+    :param quantity: Position size per contract (multiplier included).
+    :param spot_shocks: Relative spot moves, e.g. -0.1 for a 10% drop.
+    :param vol_shocks: Absolute volatility moves, e.g. 0.05 for +5 vol points.
+        Shocked volatility is floored at zero.
+    :param days_forward: Calendar days to roll every contract forward.
+    :param aggregate: Sum P&L over contracts instead of returning the cube.
+    :param max_memory_bytes: Cap on the working memory of a single chunk.
+    :param out: Optional preallocated (n_spot, n_vol, n_contracts) array, e.g.
+        a np.memmap, for the cube. Ignored when aggregate is set.
+    :return: P&L array of shape (n_spot, n_vol, n_contracts), or
+        (n_spot, n_vol) when aggregate is set.
+    """
+    S, K, T, r, sigma, quantity = (
+        np.ravel(x).astype(float)
+        for x in np.broadcast_arrays(S, K, T, r, sigma, quantity)
+    )
+    option_type = np.broadcast_to(np.asarray(option_type), S.shape)
+    spot_factor = 1.0 + np.asarray(spot_shocks, dtype=float)[:, None, None]
+    vol_shift = np.asarray(vol_shocks, dtype=float)[None, :, None]
+    n_spot, n_vol, n = spot_factor.shape[0], vol_shift.shape[1], S.size
+
+    if aggregate:
+        result = np.zeros((n_spot, n_vol))
+    elif out is not None:
+        result = out
+    else:
+        result = np.empty((n_spot, n_vol, n))
+
+    chunk = stress_chunk_size(n_spot, n_vol, max_memory_bytes)
+    rolled_T = T - days_forward / 365.0
+    for start in range(0, n, chunk):
+        rows = slice(start, min(start + chunk, n))
+        base = black_scholes_batch(
+            S[rows], K[rows], T[rows], r[rows], sigma[rows], option_type[rows]
+        )
+        shocked = black_scholes_batch(
+            S[rows] * spot_factor,
+            K[rows],
+            rolled_T[rows],
+            r[rows],
+            np.maximum(sigma[rows] + vol_shift, 0.0),
+            option_type[rows],
+        )
+        shocked -= base
+        shocked *= quantity[rows]
+        if aggregate:
+            result += shocked.sum(axis=2)
+        else:
+            result[:, :, rows] = shocked
+    return result
@@ -0,0 +1,253 @@
+# services/svi_service.py
+
+import numpy as np
+
+SVI_PARAM_NAMES = ("a", "b", "rho", "m", "sigma")
+
+_RHO_LIMIT = 0.999
+_SIGMA_FLOOR = 1e-4
+
+
+def svi_total_variance(params, k):
+    """
+    Raw SVI total variance w(k) = a + b * (rho * (k - m) + sqrt((k - m)^2 + sigma^2)).
+
+    :param params: Array of shape (..., 5) ordered as SVI_PARAM_NAMES.
+    :param k: Log-moneyness, broadcast against params[..., None].
+    """
+    a, b, rho, m, sigma = (params[..., i, None] for i in range(5))
+    x = k - m
+    return a + b * (rho * x + np.sqrt(x * x + sigma * sigma))
+
+
+def svi_jacobian(params, k):
+    """
+    Analytic Jacobian of svi_total_variance with respect to the parameters.
+
+    :return: Array of shape (..., len(k), 5).
+    """
+    a, b, rho, m, sigma = (params[..., i, None] for i in range(5))
+    x = k - m
+    root = np.sqrt(x * x + sigma * sigma)
+    return np.stack(
+        np.broadcast_arrays(
+            np.ones_like(x),
+            rho * x + root,
+            b * x,
+            -b * (rho + x / root),
+            b * sigma / root,
+        ),
+        axis=-1,
+    )
+
+
+def _pad_slices(k, w, weights):
+    """
+    Stack ragged per-slice arrays into padded 2-D arrays with zero weights.
+    """
+    sizes = [len(x) for x in k]
+    n, p = len(k), max(sizes)
+    k_pad = np.zeros((n, p))
+    w_pad = np.zeros((n, p))
+    weight_pad = np.zeros((n, p))
+    for i, size in enumerate(sizes):
+        k_pad[i, :size] = k[i]
+        w_pad[i, :size] = w[i]
+        weight_pad[i, :size] = 1.0 if weights is None else weights[i]
+    return k_pad, w_pad, weight_pad
+
+
+def _initial_guess(k, w, weights):
+    """
+    Cold-start parameters from the shape of each slice.
+    """
+    mask = weights > 0.0
+    w_min = np.where(mask, w, np.inf).min(axis=1)
+    atm = np.argmin(np.where(mask, np.abs(k), np.inf), axis=1)
+    m = k[np.arange(len(k)), atm]
+    sigma = np.full(len(k), 0.1)
+    b = np.full(len(k), 0.1)
+    a = np.maximum(w_min - b * sigma, 1e-6)
+    return np.column_stack([a, b, np.zeros(len(k)), m, sigma])
+
+
+def _project(params):
+    """
+    Clip parameters back into the admissible region after a step.
+    """
+    params[:, 1] = np.maximum(params[:, 1], 0.0)
+    params[:, 2] = np.clip(params[:, 2], -_RHO_LIMIT, _RHO_LIMIT)
+    params[:, 4] = np.maximum(params[:, 4], _SIGMA_FLOOR)
+    return params
+
+
+def calibrate_svi(k, w, weights=None, initial_params=None, max_iter=100, tol=1e-8):
+    """
+    Fit raw SVI to many expiry slices at once with Levenberg-Marquardt.
+
+    Residuals, analytic Jacobians and the damped normal equations are
+    evaluated for all unconverged slices in one array pass per iteration, so
+    thousands of slices calibrate together.
+
+    :param k: Sequence of per-slice log-moneyness arrays (may differ in length).
+    :param w: Sequence of per-slice market total variance arrays.
+    :param weights: Optional sequence of per-slice weight arrays.
+    :param initial_params: Optional (n_slices, 5) warm start, e.g. the
+        previous fit. Rows containing NaN use the cold-start guess.
+    :param max_iter: Maximum number of iterations.
+    :param tol: Relative cost improvement below which a slice has converged.
+    :return: Dict with "params" (n_slices, 5), "rmse" and "converged".
+    """
+    k, w, weights = _pad_slices(k, w, weights)
+    sqrt_weights = np.sqrt(weights)
+    params = _initial_guess(k, w, weights)
+    if initial_params is not None:
+        warm = np.asarray(initial_params, dtype=float)
+        usable = np.isfinite(warm).all(axis=1)
+        params[usable] = warm[usable]
+    params = _project(params)
+
+    def cost_of(p, rows):
+        residual = (svi_total_variance(p, k[rows]) - w[rows]) * sqrt_weights[rows]
+        return residual, np.sum(residual * residual, axis=1)
+
+    n = len(k)
+    damping = np.full(n, 1e-3)
+    converged = np.zeros(n, dtype=bool)
+    residual, cost = cost_of(params, np.arange(n))
+    active = np.arange(n)
+    eye = np.eye(5)
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        p = params[active]
+        jac = svi_jacobian(p, k[active]) * sqrt_weights[active, :, None]
+        normal = np.einsum("spi,spj->sij", jac, jac)
+        gradient = np.einsum("spi,sp->si", jac, residual[active])
+        scale = np.einsum("sii->si", normal)[:, :, None] * eye + 1e-12 * eye
+        step = np.linalg.solve(
+            normal + damping[active, None, None] * scale, -gradient[..., None]
+        )[..., 0]
+
+        trial = _project(p + step)
+        trial_residual, trial_cost = cost_of(trial, active)
+        improved = trial_cost < cost[active]
+
+        accepted = active[improved]
+        gain = cost[accepted] - trial_cost[improved]
+        params[accepted] = trial[improved]
+        residual[accepted] = trial_residual[improved]
+        cost[accepted] = trial_cost[improved]
+        damping[active] = np.where(
+            improved, damping[active] * 0.3, damping[active] * 10.0
+        )
+
+        done = np.zeros(active.size, dtype=bool)
+        done[improved] = gain <= tol * np.maximum(cost[accepted], 1e-300)
+        done |= (damping[active] > 1e10) | (np.abs(gradient).max(axis=1) < 1e-14)
+        converged[active[done]] = True
+        active = active[~done]
+
+    points = np.maximum(weights.sum(axis=1), 1.0)
+    return {
+        "params": params,
+        "rmse": np.sqrt(cost / points),
+        "converged": converged,
+    }
+
+
+def check_no_arbitrage(params, k_grid, expiries=None, tol=1e-10):
+    """
+    Evaluate static no-arbitrage conditions for fitted slices.
+
+    All slices are checked at once on a shared log-moneyness grid.
+
+    :param params: Array of shape (n_slices, 5).
+    :param k_grid: 1-D log-moneyness grid to test on.
+    :param expiries: Optional slice expiries; when given, slices are sorted by
+        expiry and checked for calendar spread arbitrage.
+    :param tol: Numerical slack for the inequalities.
+    :return: Dict of boolean arrays (n_slices,) keyed by "butterfly",
+        "min_variance", "wing", "calendar" and "arbitrage_free".
+    """
+    params = np.asarray(params, dtype=float)
+    k_grid = np.asarray(k_grid, dtype=float)
+    a, b, rho, m, sigma = (params[:, i, None] for i in range(5))
+    x = k_grid - m
+    root = np.sqrt(x * x + sigma * sigma)
+    w = a + b * (rho * x + root)
+    dw = b * (rho + x / root)
+    d2w = b * sigma * sigma / root**3
+
+    # Gatheral's density condition g(k) >= 0
+    safe_w = np.where(w > 0.0, w, np.nan)
+    g = (1.0 - k_grid * dw / (2.0 * safe_w)) ** 2 - dw * dw / 4.0 * (
+        1.0 / safe_w + 0.25
+    ) + d2w / 2.0
+    butterfly = np.all(g >= -tol, axis=1)
+
+    rho, b, sigma, a = rho[:, 0], b[:, 0], sigma[:, 0], a[:, 0]
+    min_variance = a + b * sigma * np.sqrt(1.0 - rho * rho) >= -tol
+    wing = b * (1.0 + np.abs(rho)) <= 2.0 + tol
+
+    calendar = np.ones(len(params), dtype=bool)
+    if expiries is not None:
+        order = np.argsort(np.asarray(expiries, dtype=float))
+        ordered = w[order]
+        # A slice fails if it crosses either neighbour
+        crossing = np.any(ordered[1:] < ordered[:-1] - tol, axis=1)
+        failed = np.zeros(len(params), dtype=bool)
+        failed[:-1] |= crossing
+        failed[1:] |= crossing
+        calendar[order] = ~failed
+
+    return {
+        "butterfly": butterfly,
+        "min_variance": min_variance,
+        "wing": wing,
+        "calendar": calendar,
+        "arbitrage_free": butterfly & min_variance & wing & calendar,
+    }
+
+
+def calibrate_chain(spot, rate, expiries, strikes, ivs, previous=None, **kwargs):
+    """
+    Calibrate one SVI slice per expiry from flat chain columns.
+
+    :param spot: Spot price of the underlying.
+    :param rate: Continuously compounded rate used for the forward.
+    :param expiries: Time to expiry in years for each contract.
+    :param strikes: Strike for each contract.
+    :param ivs: Implied volatility for each contract. NaN rows are skipped.
+    :param previous: Optional dict of expiry -> params from the last fit,
+        used as the warm start.
+    :return: Dict of expiry -> {"params", "rmse", "converged"}.
+    """
+    expiries, strikes, ivs = (
+        np.asarray(x, dtype=float) for x in (expiries, strikes, ivs)
+    )
+    usable = np.isfinite(ivs) & (ivs > 0.0) & (expiries > 0.0)
+    slice_expiries = np.unique(expiries[usable])
+    k, w = [], []
+    for expiry in slice_expiries:
+        rows = usable & (expiries == expiry)
+        k.append(np.log(strikes[rows] / (spot * np.exp(rate * expiry))))
+        w.append(ivs[rows] ** 2 * expiry)
+
+    if not k:
+        return {}
+
+    previous = previous or {}
+    initial = np.array(
+        [previous.get(expiry, np.full(5, np.nan)) for expiry in slice_expiries]
+    ).reshape(-1, 5)
+    fit = calibrate_svi(k, w, initial_params=initial, **kwargs)
+    return {
+        expiry: {
+            "params": fit["params"][i],
+            "rmse": fit["rmse"][i],
+            "converged": fit["converged"][i],
+        }
+        for i, expiry in enumerate(slice_expiries)
+    }
@@ -0,0 +1,178 @@
+# services/vol_surface_service.py
+
+import numpy as np
+from services.black_scholes_service import black_scholes_batch, calculate_greeks_batch
+
+# Offset between slices in the flattened node array. Log-moneyness never gets
+# anywhere near this, so one searchsorted call can locate nodes in every slice.
+_SLICE_SPAN = 1.0e3
+
+
+class VolSurface:
+    """
+    Strike x expiry implied volatility surface built from chain snapshots.
+
+    Each expiry slice is stored as piecewise-linear total variance
+    w(k) = iv^2 * T over log-moneyness k = log(K / F), with flat extrapolation
+    beyond the outer strikes. Between expiries total variance is interpolated
+    linearly in T. Slice coefficients are precomputed when a slice is set, so
+    replacing one expiry only refits that slice.
+    """
+
+    def __init__(self, spot: float, rate: float = 0.0):
+        """
+        :param spot: Spot price of the underlying.
+        :param rate: Continuously compounded rate used for the forward.
+        """
+        self.spot = spot
+        self.rate = rate
+        self._slices = {}
+        self._flat = None
+
+    @classmethod
+    def from_chain(cls, spot, rate, expiries, strikes, ivs):
+        """
+        Build a surface from flat chain columns.
+
+        :param expiries: Time to expiry in years for each contract.
+        :param strikes: Strike for each contract.
+        :param ivs: Implied volatility for each contract. NaN rows are skipped.
+        """
+        surface = cls(spot, rate)
+        expiries, strikes, ivs = (
+            np.asarray(x, dtype=float) for x in (expiries, strikes, ivs)
+        )
+        for expiry in np.unique(expiries):
+            rows = expiries == expiry
+            surface.set_slice(expiry, strikes[rows], ivs[rows])
+        return surface
+
+    @property
+    def expiries(self):
+        return sorted(self._slices)
+
+    def set_slice(self, expiry, strikes, ivs):
+        """
+        Add or replace one expiry slice and precompute its coefficients.
+
+        :param expiry: Time to expiry in years.
+        :param strikes: Strikes of the slice.
+        :param ivs: Implied volatilities of the slice. NaN or non-positive
+            entries are skipped.
+        """
+        expiry = float(expiry)
+        if expiry <= 0.0:
+            raise ValueError("Slice expiry must be positive.")
+        strikes = np.asarray(strikes, dtype=float)
+        ivs = np.asarray(ivs, dtype=float)
+        valid = np.isfinite(ivs) & (ivs > 0.0) & (strikes > 0.0)
+        if not valid.any():
+            raise ValueError(f"Slice at T={expiry} has no usable quotes.")
+
+        k = np.log(strikes[valid] / self._forward(expiry))
+        order = np.argsort(k)
+        k = k[order]
+        w = ivs[valid][order] ** 2 * expiry
+        k, first = np.unique(k, return_index=True)
+        w = w[first]
+
+        slope = np.zeros_like(w)
+        slope[:-1] = np.diff(w) / np.diff(k)
+        self._slices[expiry] = (k, w, slope)
+        self._flat = None
+
+    def remove_slice(self, expiry):
+        self._slices.pop(float(expiry), None)
+        self._flat = None
+
+    def _forward(self, expiry):
+        return self.spot * np.exp(self.rate * expiry)
+
+    def _assemble(self):
+        """
+        Concatenate the per-slice coefficients into flat lookup arrays.
+        """
+        expiries = np.array(self.expiries)
+        if expiries.size == 0:
+            raise ValueError("Surface has no slices.")
+        slices = [self._slices[expiry] for expiry in expiries]
+        counts = np.array([len(k) for k, _, _ in slices])
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        k = np.concatenate([k for k, _, _ in slices])
+        slice_ids = np.repeat(np.arange(len(slices)), counts)
+        self._flat = {
+            "expiries": expiries,
+            "starts": starts,
+            "ends": starts + counts,
+            "k_min": k[starts],
+            "k_max": k[starts + counts - 1],
+            "keys": slice_ids * _SLICE_SPAN + k,
+            "k": k,
+            "w": np.concatenate([w for _, w, _ in slices]),
+            "slope": np.concatenate([slope for _, _, slope in slices]),
+        }
+        return self._flat
+
+    def _slice_variance(self, flat, slice_ids, k):
+        """
+        Evaluate total variance of the given slices at log-moneyness k.
+        """
+        k = np.clip(k, flat["k_min"][slice_ids], flat["k_max"][slice_ids])
+        pos = np.searchsorted(flat["keys"], slice_ids * _SLICE_SPAN + k, "right") - 1
+        starts = flat["starts"][slice_ids]
+        pos = np.clip(pos, starts, np.maximum(starts, flat["ends"][slice_ids] - 2))
+        return flat["w"][pos] + flat["slope"][pos] * (k - flat["k"][pos])
+
+    def total_variance(self, K, T):
+        """
+        Vectorized total variance lookup for arrays of strikes and expiries.
+        """
+        flat = self._flat or self._assemble()
+        K, T = np.broadcast_arrays(
+            np.asarray(K, dtype=float), np.asarray(T, dtype=float)
+        )
+        shape = K.shape
+        K, T = K.ravel(), T.ravel()
+        expiries = flat["expiries"]
+        k = np.log(K / self._forward(T))
+
+        upper = np.clip(np.searchsorted(expiries, T), 0, len(expiries) - 1)
+        lower = np.clip(upper - 1, 0, None)
+        w_lower = self._slice_variance(flat, lower, k)
+        w_upper = self._slice_variance(flat, upper, k)
+
+        t_lower, t_upper = expiries[lower], expiries[upper]
+        span = np.where(t_upper > t_lower, t_upper - t_lower, 1.0)
+        alpha = np.clip((T - t_lower) / span, 0.0, 1.0)
+        w = (1.0 - alpha) * w_lower + alpha * w_upper
+
+        # Outside the quoted expiries keep the nearest slice's volatility flat
+        w = np.where(T < expiries[0], w_upper * T / expiries[0], w)
+        w = np.where(T > expiries[-1], w_upper * T / expiries[-1], w)
+        return w.reshape(shape)
+
+    def implied_vol(self, K, T):
+        """
+        Vectorized implied volatility lookup for arrays of strikes and expiries.
+        """
+        T = np.asarray(T, dtype=float)
+        w = self.total_variance(K, T)
+        return np.sqrt(np.maximum(w, 0.0) / np.where(T > 0.0, T, np.inf))
+
+    def price(self, K, T, option_type="call", out=None):
+        """
+        Price contracts off the surface with the batch Black-Scholes pricer.
+        """
+        sigma = self.implied_vol(K, T)
+        return black_scholes_batch(
+            self.spot, K, T, self.rate, sigma, option_type, out=out
+        )
+
+    def greeks(self, K, T, option_type="call", out=None):
+        """
+        Price and Greeks for contracts off the surface.
+        """
+        sigma = self.implied_vol(K, T)
+        return calculate_greeks_batch(
+            self.spot, K, T, self.rate, sigma, option_type, out=out
+        )
@@ -0,0 +1,34 @@
+# tests/conftest.py
+
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# models/__init__.py reads config.yaml from the working directory at import.
+# Tests never connect to the configured database; they rebind Session to
+# SQLite, so any well-formed postgres section will do.
+TEST_CONFIG = """\
+database:
+  postgres:
+    user: test
+    password: test
+    host: localhost
+    port: 5432
+    name: test
+"""
+
+
+def pytest_configure(config):
+    config._config_dir = tempfile.mkdtemp(prefix="config-")
+    with open(os.path.join(config._config_dir, "config.yaml"), "w") as file:
+        file.write(TEST_CONFIG)
+    config._previous_cwd = os.getcwd()
+    os.chdir(config._config_dir)
+
+
+def pytest_unconfigure(config):
+    os.chdir(config._previous_cwd)
+    shutil.rmtree(config._config_dir, ignore_errors=True)
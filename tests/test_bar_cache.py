@@ -0,0 +1,121 @@
+# tests/test_bar_cache.py
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+pytz = pytest.importorskip("pytz")
+from data.aggregate_coverage import EASTERN
+from data.bar_cache import BAR_COLUMNS, BarCache, bucket_starts, resample
+
+
+def _eastern_ms(*args):
+    return round(EASTERN.localize(datetime(*args)).timestamp() * 1000)
+
+
+def _minute_rows(day, first=(4, 0), last=(19, 59)):
+    """
+    1-minute AggregateData-like rows for one session, in UTC.
+    """
+    start = EASTERN.localize(datetime(day.year, day.month, day.day, *first))
+    count = (last[0] - first[0]) * 60 + last[1] - first[1] + 1
+    rows = []
+    for i in range(count):
+        stamp = (start + timedelta(minutes=i)).astimezone(pytz.UTC)
+        rows.append(
+            SimpleNamespace(
+                date=stamp,
+                open=i,
+                high=i + 0.5,
+                low=i - 0.5,
+                close=i + 0.25,
+                volume=1,
+            )
+        )
+    return rows
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.data_versions = {}
+        self.calls = []
+
+    def fetch_aggregates(self, ticker, multiplier, timespan, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        lo = _eastern_ms(*map(int, start_date.split("-")))
+        hi = _eastern_ms(*map(int, end_date.split("-"))) + 86_400_000
+        return [row for row in self.rows if lo <= row.date.timestamp() * 1000 < hi]
+
+
+def test_resample_ohlcv():
+    bars = {
+        "timestamp": np.array([0, 60_000, 120_000, 300_000, 360_000], dtype=np.int64),
+        "open": np.array([1.0, 2.0, 3.0, 4.0, 5.0]),
+        "high": np.array([1.5, 4.0, 3.5, 4.5, 6.0]),
+        "low": np.array([0.5, 1.0, 2.5, 3.5, 4.0]),
+        "close": np.array([1.2, 2.2, 3.2, 4.2, 5.2]),
+        "volume": np.array([10.0, 20.0, 30.0, 40.0, 50.0]),
+    }
+    result = resample(bars, 5, "minute")
+    assert result["timestamp"].tolist() == [0, 300_000]
+    assert result["open"].tolist() == [1.0, 4.0]
+    assert result["high"].tolist() == [4.0, 6.0]
+    assert result["low"].tolist() == [0.5, 3.5]
+    assert result["close"].tolist() == [3.2, 5.2]
+    assert result["volume"].tolist() == [60.0, 90.0]
+
+
+@pytest.mark.parametrize("month", [1, 7])
+def test_multi_hour_buckets_align_to_new_york(month):
+    timestamps = np.array(
+        [_eastern_ms(2024, month, 2, hour, 30) for hour in (0, 3, 4, 9, 13, 23)],
+        dtype=np.int64,
+    )
+    starts = bucket_starts(timestamps, 4, "hour")
+    expected = [_eastern_ms(2024, month, 2, hour) for hour in (0, 0, 4, 8, 12, 20)]
+    assert starts.tolist() == expected
+
+
+def test_buckets_across_dst_change():
+    # 2024-03-10 02:00 EST jumps to 03:00 EDT
+    timestamps = np.array(
+        [_eastern_ms(2024, 3, 10, 1, 30), _eastern_ms(2024, 3, 10, 5, 0)],
+        dtype=np.int64,
+    )
+    starts = bucket_starts(timestamps, 4, "hour")
+    assert starts.tolist() == [
+        _eastern_ms(2024, 3, 10, 0),
+        _eastern_ms(2024, 3, 10, 4),
+    ]
+
+
+@pytest.mark.parametrize("day", [datetime(2024, 1, 2), datetime(2024, 7, 2)])
+def test_intraday_bars_keep_the_whole_new_york_session(day):
+    rows = _minute_rows(day.date())
+    cache = BarCache(FakeClient(rows))
+    date = day.strftime("%Y-%m-%d")
+
+    bars = cache.get_bars("SPY", 5, "minute", date, date)
+    # 04:00 to 20:00 Eastern
+    assert len(bars["timestamp"]) == 192
+    assert bars["timestamp"][0] == _eastern_ms(day.year, day.month, day.day, 4)
+    assert bars["timestamp"][-1] == _eastern_ms(day.year, day.month, day.day, 19, 55)
+    assert bars["volume"].sum() == len(rows)
+
+    hourly = cache.get_bars("SPY", 1, "hour", date, date)
+    assert len(hourly["timestamp"]) == 16
+    assert set(BAR_COLUMNS) == set(hourly)
+
+
+def test_derived_series_rebuilt_on_new_base_data():
+    client = FakeClient(_minute_rows(datetime(2024, 1, 2).date()))
+    cache = BarCache(client)
+    cache.get_bars("SPY", 5, "minute", "2024-01-02", "2024-01-02")
+    cache.get_bars("SPY", 5, "minute", "2024-01-02", "2024-01-02")
+    assert (cache.misses, cache.hits) == (1, 1)
+
+    client.data_versions[("SPY", 1, "minute")] = 1
+    cache.get_bars("SPY", 5, "minute", "2024-01-02", "2024-01-02")
+    assert cache.misses == 2
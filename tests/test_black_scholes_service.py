@@ -0,0 +1,211 @@
+# tests/test_black_scholes_service.py
+
+import numpy as np
+import pytest
+from services.black_scholes_service import (
+    GREEK_NAMES,
+    SECOND_ORDER_GREEK_NAMES,
+    black_scholes,
+    black_scholes_batch,
+    calculate_greeks,
+    calculate_greeks_batch,
+    implied_volatility_batch,
+    price_and_greeks,
+)
+
+
+@pytest.fixture
+def chain():
+    rng = np.random.default_rng(11)
+    n = 400
+    return {
+        "S": rng.uniform(50.0, 150.0, n),
+        "K": rng.uniform(50.0, 150.0, n),
+        "T": rng.uniform(0.01, 3.0, n),
+        "r": rng.uniform(-0.01, 0.08, n),
+        "sigma": rng.uniform(0.05, 1.0, n),
+        "option_type": np.where(rng.random(n) < 0.5, "call", "put"),
+    }
+
+
+def _rows(chain):
+    columns = [chain[name] for name in ("S", "K", "T", "r", "sigma", "option_type")]
+    return list(zip(*(column.tolist() for column in columns)))
+
+
+def test_batch_matches_scalar(chain):
+    prices = black_scholes_batch(**chain)
+    greeks = calculate_greeks_batch(**chain)
+    for i, row in enumerate(_rows(chain)):
+        assert prices[i] == pytest.approx(black_scholes(*row), rel=1e-12, abs=1e-12)
+        scalar = calculate_greeks(*row)
+        for name in GREEK_NAMES[1:]:
+            assert greeks[name][i] == pytest.approx(scalar[name], rel=1e-10, abs=1e-12)
+    np.testing.assert_array_equal(greeks["price"], prices)
+
+
+def test_boolean_call_mask_matches_strings(chain):
+    by_string = calculate_greeks_batch(**chain)
+    mask = dict(chain, option_type=chain["option_type"] == "call")
+    by_mask = calculate_greeks_batch(**mask)
+    for name in GREEK_NAMES:
+        np.testing.assert_array_equal(by_string[name], by_mask[name])
+
+
+def test_broadcasts_scalars_against_arrays():
+    strikes = np.array([90.0, 100.0, 110.0])
+    greeks = calculate_greeks_batch(100.0, strikes, 0.5, 0.03, 0.2, "put")
+    for i, strike in enumerate(strikes):
+        assert greeks["delta"][i] == pytest.approx(
+            calculate_greeks(100.0, strike, 0.5, 0.03, 0.2, "put")["delta"]
+        )
+
+
+def test_expired_contracts_are_worth_intrinsic():
+    S = np.array([90.0, 110.0, 90.0, 110.0, 100.0])
+    is_call = np.array([True, True, False, False, True])
+    T = np.array([0.0, 0.0, -0.1, 0.0, 0.0])
+    greeks = calculate_greeks_batch(S, 100.0, T, 0.05, 0.2, is_call)
+    np.testing.assert_allclose(greeks["price"], [0.0, 10.0, 10.0, 0.0, 0.0])
+    np.testing.assert_allclose(greeks["delta"][:4], [0.0, 1.0, -1.0, 0.0])
+    for name in ("gamma", "theta", "vega", "rho"):
+        assert np.all(np.isfinite(greeks[name]))
+    np.testing.assert_array_equal(greeks["gamma"], 0.0)
+    np.testing.assert_array_equal(greeks["vega"], 0.0)
+
+
+def test_zero_volatility_is_discounted_forward_payoff():
+    S = np.array([90.0, 110.0, 90.0, 110.0])
+    is_call = np.array([True, True, False, False])
+    T, r, K = 0.5, 0.05, 100.0
+    strike_pv = K * np.exp(-r * T)
+    greeks = calculate_greeks_batch(S, K, T, r, 0.0, is_call)
+    expected = np.maximum(np.where(is_call, S - strike_pv, strike_pv - S), 0.0)
+    np.testing.assert_allclose(greeks["price"], expected)
+    np.testing.assert_allclose(greeks["delta"], [0.0, 1.0, -1.0, 0.0])
+    np.testing.assert_array_equal(greeks["gamma"], 0.0)
+    np.testing.assert_array_equal(greeks["vega"], 0.0)
+
+
+def test_out_buffers_are_filled_in_place(chain):
+    n = len(chain["S"])
+    out = {name: np.empty(n) for name in GREEK_NAMES}
+    greeks = calculate_greeks_batch(**chain, out=out)
+    expected = calculate_greeks_batch(**chain)
+    for name in GREEK_NAMES:
+        assert greeks[name] is out[name]
+        np.testing.assert_array_equal(out[name], expected[name])
+
+    prices = np.empty(n)
+    assert black_scholes_batch(**chain, out=prices) is prices
+    np.testing.assert_array_equal(prices, expected["price"])
+
+
+def test_out_buffers_may_cover_some_greeks_only(chain):
+    delta = np.empty(len(chain["S"]))
+    greeks = calculate_greeks_batch(**chain, out={"delta": delta})
+    assert greeks["delta"] is delta
+    assert greeks["gamma"] is not delta
+
+
+
+def _solve(chain, prices, **kwargs):
+    return implied_volatility_batch(
+        prices,
+        chain["S"],
+        chain["K"],
+        chain["T"],
+        chain["r"],
+        chain["option_type"],
+        **kwargs,
+    )
+
+
+def test_implied_volatility_round_trip(chain):
+    prices = black_scholes_batch(**chain)
+    iv, converged = _solve(chain, prices)
+
+    assert converged.mean() > 0.95
+    assert np.all(np.isnan(iv[~converged]))
+    np.testing.assert_allclose(iv[converged], chain["sigma"][converged], atol=1e-4)
+    solved = {name: value[converged] for name, value in chain.items()}
+    repriced = black_scholes_batch(**dict(solved, sigma=iv[converged]))
+    np.testing.assert_allclose(repriced, prices[converged], atol=1e-7)
+
+
+def test_unsolvable_prices_are_flagged():
+    S, K, T, r = 100.0, 100.0, np.array([0.5, 0.5, 0.5, 0.0]), 0.03
+    # Below intrinsic, above the spot ceiling, zero, and expired
+    prices = np.array([-1.0, 150.0, 0.0, 5.0])
+    iv, converged = implied_volatility_batch(prices, S, K, T, r, "call")
+    assert not converged.any()
+    assert np.all(np.isnan(iv))
+
+
+def test_unresolved_volatility_is_not_converged():
+    # Deep in the money: the time value is far below tol for any small sigma
+    price = black_scholes_batch(200.0, 50.0, 0.1, 0.03, 0.05, "call")
+    iv, converged = implied_volatility_batch(price, 200.0, 50.0, 0.1, 0.03, "call")
+    assert not converged
+    assert np.isnan(iv)
+
+
+def test_warm_start_converges_immediately(chain):
+    prices = black_scholes_batch(**chain)
+    _, cold = _solve(chain, prices, max_iter=1)
+    iv, warm = _solve(chain, prices, max_iter=1, initial_sigma=chain["sigma"])
+    assert warm.sum() > cold.sum()
+    np.testing.assert_allclose(iv[warm], chain["sigma"][warm])
+
+    # NaN and non-positive warm starts fall back to the cold guess
+    fallback = np.where(np.arange(len(prices)) % 2 == 0, np.nan, -1.0)
+    np.testing.assert_array_equal(
+        _solve(chain, prices, initial_sigma=fallback)[1], _solve(chain, prices)[1]
+    )
+
+
+# Each higher-order Greek as (name, first-order Greek it differentiates,
+# bumped input). vega is quoted per 1%, so volga differentiates 100 * vega.
+HIGHER_ORDER = (
+    ("vanna", "delta", "sigma"),
+    ("volga", "vega", "sigma"),
+    ("charm", "delta", "T"),
+    ("speed", "gamma", "S"),
+    ("zomma", "gamma", "sigma"),
+    ("vanna_vol", "vanna", "sigma"),
+    ("ultima", "volga", "sigma"),
+)
+BUMPS = {"S": 1e-3, "sigma": 1e-5, "T": 1e-5}
+
+
+@pytest.mark.parametrize("name, base, bumped", HIGHER_ORDER)
+def test_higher_order_greeks_match_finite_differences(chain, name, base, bumped):
+    # Keep clear of expiry and zero vol, where central differences break down
+    chain = dict(chain, T=chain["T"] + 0.1, sigma=chain["sigma"] + 0.05)
+    h = BUMPS[bumped]
+    up = dict(chain, **{bumped: chain[bumped] + h})
+    down = dict(chain, **{bumped: chain[bumped] - h})
+    up, down = (price_and_greeks(**inputs, second_order=True) for inputs in (up, down))
+    scale = 100.0 if base == "vega" else 1.0
+    estimate = scale * (up[base] - down[base]) / (2.0 * h)
+    if name == "charm":
+        # charm is the change in delta as time passes, i.e. as T shrinks
+        estimate = -estimate
+
+    analytic = price_and_greeks(**chain, second_order=True)[name]
+    tolerance = 1e-5 * np.maximum(1.0, np.abs(analytic).max())
+    np.testing.assert_allclose(analytic, estimate, rtol=1e-4, atol=tolerance)
+
+
+def test_first_order_values_match_greeks_batch(chain):
+    fused = price_and_greeks(**chain, second_order=True)
+    greeks = calculate_greeks_batch(**chain)
+    assert set(fused) == set(GREEK_NAMES) | set(SECOND_ORDER_GREEK_NAMES)
+    for name in GREEK_NAMES:
+        np.testing.assert_array_equal(fused[name], greeks[name])
+
+
+def test_scalar_inputs_return_floats():
+    results = price_and_greeks(100.0, 95.0, 0.5, 0.03, 0.2, "call", second_order=True)
+    assert all(type(value) is float for value in results.values())
+    assert results["price"] == pytest.approx(black_scholes(100.0, 95.0, 0.5, 0.03, 0.2))
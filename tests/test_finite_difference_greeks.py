@@ -0,0 +1,50 @@
+# tests/test_finite_difference_greeks.py
+
+import numpy as np
+import pytest
+from services.black_scholes_service import black_scholes_batch, calculate_greeks_batch
+from services.finite_difference_greeks import (
+    compare_with_analytic,
+    finite_difference_greeks,
+)
+
+# Central differences for delta, vega and rho; theta is a forward step of
+# one day, so its gap is the change in theta over that day.
+TOLERANCES = {"delta": 1e-3, "gamma": 1e-4, "theta": 0.1, "vega": 1e-3, "rho": 1e-6}
+
+
+@pytest.fixture
+def contracts():
+    rng = np.random.default_rng(5)
+    n = 200
+    return {
+        "S": rng.uniform(80.0, 120.0, n),
+        "K": rng.uniform(80.0, 120.0, n),
+        "T": rng.uniform(0.25, 2.0, n),
+        "r": rng.uniform(0.0, 0.06, n),
+        "sigma": rng.uniform(0.1, 0.6, n),
+        "option_type": np.where(rng.random(n) < 0.5, "call", "put"),
+    }
+
+
+def test_black_scholes_matches_analytic(contracts):
+    gaps = compare_with_analytic(black_scholes_batch, **contracts)
+    assert set(gaps) == set(TOLERANCES)
+    for name, tolerance in TOLERANCES.items():
+        assert gaps[name] < tolerance, name
+
+
+def test_boolean_call_mask_matches_strings(contracts):
+    mask = dict(contracts, option_type=contracts["option_type"] == "call")
+    assert compare_with_analytic(black_scholes_batch, **mask) == (
+        compare_with_analytic(black_scholes_batch, **contracts)
+    )
+
+
+def test_input_shape_is_preserved(contracts):
+    grid = {name: value[:12].reshape(3, 4) for name, value in contracts.items()}
+    numeric = finite_difference_greeks(black_scholes_batch, **grid)
+    analytic = calculate_greeks_batch(**grid)
+    for name, value in numeric.items():
+        assert value.shape == (3, 4)
+        np.testing.assert_allclose(value, analytic[name], atol=TOLERANCES.get(name, 0))
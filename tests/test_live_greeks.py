@@ -0,0 +1,66 @@
+# tests/test_live_greeks.py
+
+import numpy as np
+import pytest
+from services.black_scholes_service import black_scholes_batch
+from services.live_greeks import TaylorGreeks
+
+# Up to the edge of the trusted range; at exactly +-1 rounding may tip a move
+# outside it and force a reprice
+MOVE_FRACTIONS = np.linspace(-0.999, 0.999, 9)
+
+
+@pytest.fixture
+def chain():
+    rng = np.random.default_rng(7)
+    n = 5000
+    return {
+        "S": 100.0,
+        "K": rng.uniform(70.0, 130.0, n),
+        "T": np.concatenate(
+            [rng.uniform(0.002, 0.05, n // 2), rng.uniform(0.05, 2.0, n - n // 2)]
+        ),
+        "r": 0.03,
+        "sigma": rng.uniform(0.05, 0.8, n),
+        "option_type": np.where(rng.random(n) < 0.5, "call", "put"),
+    }
+
+
+def test_error_bound_covers_every_move_in_range(chain):
+    live = TaylorGreeks(**chain, tolerance=np.inf, max_age=np.inf)
+    S, sigma = chain["S"], chain["sigma"]
+    for spot_fraction in MOVE_FRACTIONS:
+        for vol_fraction in MOVE_FRACTIONS:
+            spot = S * (1.0 + spot_fraction * live.max_spot_move)
+            vol = sigma + vol_fraction * live.max_vol_move
+            values = live.tick(spot, vol, now=live.anchor_time)
+            assert not values["exact"]
+            exact = black_scholes_batch(
+                spot, chain["K"], chain["T"], chain["r"], vol, chain["option_type"]
+            )
+            error = np.abs(values["price"] - exact)
+            assert np.all(error <= values["error_bound"] + 1e-12)
+
+
+def test_vol_only_move_has_nonzero_bound(chain):
+    live = TaylorGreeks(**chain, tolerance=np.inf, max_age=np.inf)
+    values = live.tick(chain["S"], chain["sigma"] + 0.01, now=live.anchor_time)
+    assert np.all(values["error_bound"] > 0.0)
+
+
+def test_reprice_when_bound_exceeds_tolerance(chain):
+    live = TaylorGreeks(**chain, tolerance=1e-6, max_age=np.inf)
+    values = live.tick(chain["S"] * 1.01, now=live.anchor_time)
+    assert values["exact"]
+    assert live.full_reprices == 2
+    np.testing.assert_allclose(
+        values["price"],
+        black_scholes_batch(
+            chain["S"] * 1.01,
+            chain["K"],
+            chain["T"],
+            chain["r"],
+            chain["sigma"],
+            chain["option_type"],
+        ),
+    )
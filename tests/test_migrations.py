@@ -0,0 +1,65 @@
+# tests/test_migrations.py
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from data.migrations import migrate
+from models.models import AggregateData
+
+
+@pytest.fixture
+def legacy_engine():
+    engine = sqlalchemy.create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(
+            sqlalchemy.text(
+                "CREATE TABLE aggregate_data (id INTEGER PRIMARY KEY, ticker VARCHAR, "
+                "date DATETIME, open FLOAT, high FLOAT, low FLOAT, close FLOAT, "
+                "volume INTEGER)"
+            )
+        )
+        connection.execute(
+            sqlalchemy.text(
+                "INSERT INTO aggregate_data (ticker, date, close) "
+                "VALUES ('SPY', '2024-01-02 05:00:00', 472.65)"
+            )
+        )
+        connection.execute(
+            sqlalchemy.text(
+                "CREATE TABLE option_data (id INTEGER PRIMARY KEY, ticker VARCHAR, "
+                "date DATETIME, delta FLOAT, gamma FLOAT, theta FLOAT, vega FLOAT, "
+                "rho FLOAT)"
+            )
+        )
+    yield engine
+    engine.dispose()
+
+
+def _columns(engine, table):
+    return {c["name"] for c in sqlalchemy.inspect(engine).get_columns(table)}
+
+
+def test_migrate_adds_columns_and_tables(legacy_engine):
+    added = migrate(legacy_engine)
+
+    assert ("aggregate_data", "multiplier") in added
+    assert ("aggregate_data", "timespan") in added
+    assert ("option_data", "price") in added
+    assert ("option_data", "iv") in added
+    assert {"multiplier", "timespan"} <= _columns(legacy_engine, "aggregate_data")
+    assert {"price", "iv"} <= _columns(legacy_engine, "option_data")
+    tables = sqlalchemy.inspect(legacy_engine).get_table_names()
+    assert {"aggregate_coverage", "positions"} <= set(tables)
+
+    # Legacy rows keep no resolution, so they never match a resolution query
+    with legacy_engine.connect() as connection:
+        rows = connection.execute(
+            sqlalchemy.select(AggregateData.ticker, AggregateData.timespan)
+        ).all()
+    assert [tuple(row) for row in rows] == [("SPY", None)]
+
+
+def test_migrate_is_idempotent(legacy_engine):
+    migrate(legacy_engine)
+    assert migrate(legacy_engine) == []
@@ -0,0 +1,22 @@
+# tests/test_monte_carlo_service.py
+
+import numpy as np
+from services.black_scholes_service import black_scholes_batch
+from services.monte_carlo_service import monte_carlo_batch
+
+S, K, T, r, sigma = 100.0, np.array([90.0, 100.0, 110.0, 100.0]), 0.5, 0.03, 0.25
+OPTION_TYPES = np.array(["call", "put", "call", "put"])
+
+
+def test_batch_converges_to_black_scholes():
+    prices = monte_carlo_batch(
+        S, K, T, r, sigma, OPTION_TYPES, n_paths=200_000, seed=3
+    )
+    expected = black_scholes_batch(S, K, T, r, sigma, OPTION_TYPES)
+    np.testing.assert_allclose(prices, expected, atol=0.1)
+
+
+def test_boolean_call_mask_matches_strings():
+    by_string = monte_carlo_batch(S, K, T, r, sigma, OPTION_TYPES, seed=3)
+    by_mask = monte_carlo_batch(S, K, T, r, sigma, OPTION_TYPES == "call", seed=3)
+    np.testing.assert_array_equal(by_mask, by_string)
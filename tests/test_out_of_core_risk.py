@@ -0,0 +1,68 @@
+# tests/test_out_of_core_risk.py
+
+from datetime import datetime
+import numpy as np
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+from sqlalchemy.orm import sessionmaker
+
+from models.models import Base, OptionData
+from services.black_scholes_service import calculate_greeks_batch
+from services.out_of_core_risk import (
+    build_contract_store,
+    load_results,
+    option_data_contract_blocks,
+    run_chain_risk,
+)
+
+SNAPSHOT = datetime(2024, 1, 2)
+ROWS = (
+    ("O:SPY240119C00470000", 0.12),
+    ("O:SPY240315P00450000", 0.18),
+    ("O:SPY241220C00500000", None),
+)
+
+
+@pytest.fixture
+def session():
+    engine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        OptionData(ticker=ticker, date=SNAPSHOT, iv=iv) for ticker, iv in ROWS
+    )
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_blocks_carry_contract_terms_and_stored_iv(session):
+    blocks = list(option_data_contract_blocks(session, block_rows=2))
+    assert [len(block["strike"]) for block in blocks] == [2, 1]
+
+    columns = {
+        name: np.concatenate([block[name] for block in blocks])
+        for name in ("strike", "expiry", "is_call", "sigma")
+    }
+    np.testing.assert_array_equal(columns["strike"], [470.0, 450.0, 500.0])
+    np.testing.assert_array_equal(columns["is_call"], [True, False, True])
+    np.testing.assert_allclose(columns["expiry"], np.array([17, 73, 353]) / 365.0)
+    np.testing.assert_array_equal(columns["sigma"], [0.12, 0.18, np.nan])
+
+
+def test_blocks_feed_the_contract_store(session, tmp_path):
+    blocks = [
+        dict(block, spot=np.full(len(block["strike"]), 475.0), rate=0.05)
+        for block in option_data_contract_blocks(session)
+    ]
+    block = blocks[0]
+    build_contract_store(tmp_path, len(ROWS), blocks)
+    run_chain_risk(tmp_path)
+
+    expected = calculate_greeks_batch(
+        475.0, block["strike"], block["expiry"], 0.05, block["sigma"], block["is_call"]
+    )
+    results = load_results(tmp_path)
+    np.testing.assert_array_equal(results["price"], expected["price"])
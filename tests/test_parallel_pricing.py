@@ -0,0 +1,66 @@
+# tests/test_parallel_pricing.py
+
+import numpy as np
+import pytest
+from services.black_scholes_service import (
+    GREEK_NAMES,
+    black_scholes_batch,
+    calculate_greeks_batch,
+    implied_volatility_batch,
+)
+from services.parallel_pricing import SharedMemoryPricer
+
+
+@pytest.fixture(scope="module")
+def pricer():
+    # min_parallel_rows=0 sends every batch through the worker processes
+    with SharedMemoryPricer(processes=2, min_parallel_rows=0) as pricer:
+        yield pricer
+
+
+@pytest.fixture
+def chain():
+    rng = np.random.default_rng(23)
+    n = 1_001
+    return {
+        "S": rng.uniform(50.0, 150.0, n),
+        "K": rng.uniform(50.0, 150.0, n),
+        "T": rng.uniform(0.0, 2.0, n),
+        "r": rng.uniform(0.0, 0.06, n),
+        "sigma": rng.uniform(0.05, 0.8, n),
+        "option_type": np.where(rng.random(n) < 0.5, "call", "put"),
+    }
+
+
+def test_greeks_match_in_process(pricer, chain):
+    parallel = pricer.calculate_greeks(**chain)
+    expected = calculate_greeks_batch(**chain)
+    assert set(parallel) == set(GREEK_NAMES)
+    for name in GREEK_NAMES:
+        np.testing.assert_array_equal(parallel[name], expected[name])
+
+
+def test_implied_volatility_matches_in_process(pricer, chain):
+    prices = black_scholes_batch(**chain)
+    args = [prices] + [chain[name] for name in ("S", "K", "T", "r", "option_type")]
+    iv, converged = pricer.implied_volatility(*args)
+    expected_iv, expected_converged = implied_volatility_batch(*args)
+    np.testing.assert_array_equal(converged, expected_converged)
+    np.testing.assert_array_equal(iv, expected_iv)
+
+
+def test_warm_start_and_solver_options_reach_workers(pricer, chain):
+    prices = black_scholes_batch(**chain)
+    args = [prices] + [chain[name] for name in ("S", "K", "T", "r", "option_type")]
+    warm = np.where(np.arange(len(prices)) % 3 == 0, np.nan, chain["sigma"])
+    iv, converged = pricer.implied_volatility(*args, initial_sigma=warm, max_iter=1)
+    expected_iv, expected_converged = implied_volatility_batch(
+        *args, initial_sigma=warm, max_iter=1
+    )
+    np.testing.assert_array_equal(converged, expected_converged)
+    np.testing.assert_array_equal(iv, expected_iv)
+
+
+def test_empty_batch(pricer):
+    greeks = pricer.calculate_greeks([], [], [], [], [], [])
+    assert all(greeks[name].shape == (0,) for name in GREEK_NAMES)
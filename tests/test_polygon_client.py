@@ -0,0 +1,214 @@
+# tests/test_polygon_client.py
+
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import pytest
+
+pytest.importorskip("polygon")
+sqlalchemy = pytest.importorskip("sqlalchemy")
+from sqlalchemy.pool import StaticPool
+
+from data.aggregate_coverage import EASTERN
+from data.polygon_client import PolygonClient
+from models.models import Base, Session
+from data.rate_limiter import TokenBucket
+from data.trading_calendar import trading_sessions
+
+KEY = ("SPY", 1, "day")
+
+
+class _AggsHandler(BaseHTTPRequestHandler):
+    """
+    Serves /v2/aggs/ticker/.../range/... with one bar per trading session,
+    stamped at New York midnight, page_size bars per page.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        *_, ticker, _, multiplier, timespan, first, last = url.path.split("/")
+        offset = int(parse_qs(url.query).get("cursor", ["0"])[0])
+        self.server.requests.append((ticker, first, last, offset))
+
+        sessions = trading_sessions(first, last)
+        page = sessions[offset : offset + self.server.page_size]
+        body = {"status": "OK", "results": [_bar(day) for day in page]}
+        if offset + self.server.page_size < len(sessions):
+            body["next_url"] = (
+                f"{self.server.base_url}{url.path}"
+                f"?cursor={offset + self.server.page_size}"
+            )
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _bar(day):
+    midnight = EASTERN.localize(datetime.strptime(str(day), "%Y-%m-%d"))
+    close = float(day.astype(np.int64))
+    return {
+        "t": int(midnight.timestamp() * 1000),
+        "o": close,
+        "h": close + 1,
+        "l": close - 1,
+        "c": close,
+        "v": 100,
+    }
+
+
+@pytest.fixture
+def fake_polygon():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _AggsHandler)
+    server.requests = []
+    server.page_size = 2
+    server.base_url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def database():
+    engine = sqlalchemy.create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    previous = Session.kw.get("bind")
+    Session.configure(bind=engine)
+    yield engine
+    Session.configure(bind=previous)
+    engine.dispose()
+
+
+def _client(fake_polygon, rate_limiter=None):
+    return PolygonClient(
+        "test-key",
+        yield_curve=object(),
+        rate_limiter=rate_limiter or TokenBucket(1000.0),
+        base_url=fake_polygon.base_url,
+    )
+
+
+def _closes(sessions):
+    return [float(day) for day in sessions.astype(np.int64)]
+
+
+def test_every_page_takes_a_token(fake_polygon, database):
+    client = _client(fake_polygon)
+    rows = client.fetch_aggregates(*KEY, "2024-01-02", "2024-01-12")
+
+    sessions = trading_sessions("2024-01-02", "2024-01-12")
+    assert [row.close for row in rows] == _closes(sessions)
+    # 9 sessions in pages of 2
+    assert [offset for *_, offset in fake_polygon.requests] == [0, 2, 4, 6, 8]
+    assert client.rate_limiter.acquired == len(fake_polygon.requests)
+
+
+def test_pages_are_paced_by_the_rate_budget(fake_polygon, database):
+    client = _client(fake_polygon, TokenBucket(rate=20.0, capacity=1))
+    started = time.monotonic()
+    client.fetch_aggregates(*KEY, "2024-01-02", "2024-01-08")
+    elapsed = time.monotonic() - started
+
+    # 5 sessions are 3 pages: one burst token, then two paced at 20/s
+    assert len(fake_polygon.requests) == 3
+    assert elapsed >= 2 / 20.0 * 0.9
+    assert client.rate_limiter.waited > 0
+
+
+def test_only_missing_sessions_are_fetched(fake_polygon, database):
+    client = _client(fake_polygon)
+    client.fetch_aggregates(*KEY, "2024-01-02", "2024-01-05")
+
+    fake_polygon.requests.clear()
+    rows = client.fetch_aggregates(*KEY, "2024-01-02", "2024-01-12")
+    assert {(first, last) for _, first, last, _ in fake_polygon.requests} == {
+        ("2024-01-08", "2024-01-12")
+    }
+    sessions = trading_sessions("2024-01-02", "2024-01-12")
+    assert [row.close for row in rows] == _closes(sessions)
+
+    # The weekend between the two fetches does not split coverage
+    with database.connect() as connection:
+        spans = connection.execute(
+            sqlalchemy.text("SELECT start, \"end\" FROM aggregate_coverage")
+        ).all()
+    assert [(start[:10], end[:10]) for start, end in spans] == [
+        ("2024-01-02", "2024-01-12")
+    ]
+
+    fake_polygon.requests.clear()
+    client.fetch_aggregates(*KEY, "2024-01-03", "2024-01-11")
+    assert fake_polygon.requests == []
+
+
+def test_overlapping_fetches_store_each_session_once(fake_polygon, database):
+    client = _client(fake_polygon)
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def fetch(start_date, end_date):
+        barrier.wait()
+        results[start_date] = client.fetch_aggregates(*KEY, start_date, end_date)
+
+    threads = [
+        threading.Thread(target=fetch, args=("2024-01-02", "2024-01-10")),
+        threading.Thread(target=fetch, args=("2024-01-04", "2024-01-12")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results["2024-01-02"]) == 7
+    assert len(results["2024-01-04"]) == 7
+    with database.connect() as connection:
+        stored = connection.execute(
+            sqlalchemy.text("SELECT COUNT(*), COUNT(DISTINCT date) FROM aggregate_data")
+        ).one()
+    assert tuple(stored) == (9, 9)
+
+
+def test_suspended_stream_does_not_block_fetches(fake_polygon, database):
+    client = _client(fake_polygon)
+    stream = client.stream_aggregates(*KEY, "2024-01-02", "2024-01-12", batch_rows=2)
+    batches = [next(stream)]
+
+    fetcher = threading.Thread(
+        target=client.fetch_aggregates, args=(*KEY, "2024-01-02", "2024-01-05")
+    )
+    fetcher.start()
+    fetcher.join(timeout=5)
+    assert not fetcher.is_alive()
+
+    batches.extend(stream)
+    closes = np.concatenate([batch["close"] for batch in batches]).tolist()
+    assert closes == _closes(trading_sessions("2024-01-02", "2024-01-12"))
+
+    # The stream stopped storing once the fetch replaced its rows
+    with database.connect() as connection:
+        stored = connection.execute(
+            sqlalchemy.text("SELECT COUNT(*), COUNT(DISTINCT date) FROM aggregate_data")
+        ).one()
+    assert stored[0] == stored[1]
+
+    fake_polygon.requests.clear()
+    rows = client.fetch_aggregates(*KEY, "2024-01-02", "2024-01-12")
+    assert {(first, last) for _, first, last, _ in fake_polygon.requests} == {
+        ("2024-01-08", "2024-01-12")
+    }
+    assert len(rows) == 9
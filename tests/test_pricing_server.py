@@ -0,0 +1,118 @@
+# tests/test_pricing_server.py
+
+import http.client
+import json
+import threading
+import numpy as np
+import pytest
+from services.black_scholes_service import calculate_greeks_batch
+from services.pricing_server import (
+    BatcherStopped,
+    MicroBatcher,
+    PricingHTTPServer,
+    PricingRequestHandler,
+)
+
+PAYLOAD = {"S": 100.0, "K": 105.0, "T": 0.5, "r": 0.03, "sigma": 0.2}
+
+
+def test_batched_results_match_kernel():
+    batcher = MicroBatcher(window=0.01).start()
+    try:
+        futures = [
+            batcher.submit(dict(PAYLOAD, K=[strike, strike + 5.0]))
+            for strike in (90.0, 100.0, 110.0)
+        ]
+        results = [future.result(timeout=5) for future in futures]
+    finally:
+        batcher.stop()
+    for strike, result in zip((90.0, 100.0, 110.0), results):
+        expected = calculate_greeks_batch(
+            100.0, [strike, strike + 5.0], 0.5, 0.03, 0.2, True
+        )
+        assert result["price"].tolist() == pytest.approx(expected["price"].tolist())
+
+
+def test_stop_fails_queued_and_later_requests():
+    batcher = MicroBatcher()
+    queued = [batcher.submit(PAYLOAD) for _ in range(3)]
+    batcher.stop()
+    for future in queued:
+        with pytest.raises(BatcherStopped):
+            future.result(timeout=0)
+    with pytest.raises(BatcherStopped):
+        batcher.submit(PAYLOAD).result(timeout=0)
+
+
+@pytest.fixture
+def slow_server():
+    release = threading.Event()
+
+    def kernel(*columns):
+        release.wait(5)
+        return calculate_greeks_batch(*columns)
+
+    server = PricingHTTPServer(("127.0.0.1", 0), PricingRequestHandler)
+    server.batcher = MicroBatcher(kernel=kernel).start()
+    server.request_timeout = 0.1
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    release.set()
+    server.shutdown()
+    server.batcher.stop()
+    server.server_close()
+
+
+def _post(server, payload):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    try:
+        connection.request("POST", "/price", json.dumps(payload))
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_request_timeout_returns_503(slow_server):
+    status, body = _post(slow_server, PAYLOAD)
+    assert status == 503
+    assert "timed out" in body["error"]
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("K", [[100.0, 105.0], [110.0, 115.0]]),
+        ("option_type", "cal"),
+        ("S", [1.0, 2.0, 3.0]),
+    ],
+)
+def test_submit_rejects_malformed_requests(field, value):
+    batcher = MicroBatcher()
+    payload = dict(PAYLOAD, K=[100.0, 105.0])
+    payload[field] = value
+    with pytest.raises(ValueError):
+        batcher.submit(payload)
+    assert batcher.metrics()["queue_depth"] == 0
+
+
+def test_failing_request_does_not_fail_its_batch():
+    def kernel(S, K, T, r, sigma, is_call):
+        if np.any(K <= 0.0):
+            raise ValueError("Strike must be positive")
+        return calculate_greeks_batch(S, K, T, r, sigma, is_call)
+
+    batcher = MicroBatcher(kernel=kernel, window=0.05)
+    bad = batcher.submit(dict(PAYLOAD, K=-1.0))
+    good = batcher.submit(dict(PAYLOAD, K=[100.0, 110.0]))
+    batcher.start()
+    try:
+        result = good.result(timeout=5)
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+    finally:
+        batcher.stop()
+    expected = calculate_greeks_batch(100.0, [100.0, 110.0], 0.5, 0.03, 0.2, True)
+    assert result["price"].tolist() == pytest.approx(expected["price"].tolist())
+    assert batcher.metrics()["batches"] == 1
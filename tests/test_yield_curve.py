@@ -0,0 +1,112 @@
+# tests/test_yield_curve.py
+
+import json
+import math
+from datetime import date
+import numpy as np
+import pytest
+from data.yield_curve import (
+    FIXTURE_PATH,
+    TREASURY_SERIES,
+    YieldCurve,
+    YieldCurveProvider,
+)
+
+AS_OF = date(2024, 1, 2)
+
+
+def _fixture_points():
+    with open(FIXTURE_PATH, "r") as f:
+        return json.load(f)["points"]
+
+
+def _zero_rate(yield_percent):
+    return 2.0 * math.log1p(yield_percent / 200.0)
+
+
+@pytest.fixture
+def provider(tmp_path):
+    return YieldCurveProvider(
+        fixture_path=FIXTURE_PATH, cache_path=str(tmp_path / "yields.json")
+    )
+
+
+def test_rates_at_pillars_match_fixture(provider):
+    points = _fixture_points()
+    maturities = np.array([TREASURY_SERIES[s] for s in points])
+    expected = np.array([_zero_rate(points[s]) for s in points])
+    np.testing.assert_allclose(provider.rate(maturities, AS_OF), expected)
+
+
+def test_rates_interpolate_log_discount_and_extrapolate_flat(provider):
+    points = _fixture_points()
+    r2, r3 = _zero_rate(points["DGS2"]), _zero_rate(points["DGS3"])
+    expected = (0.5 * (2.0 * r2 + 3.0 * r3)) / 2.5
+    assert provider.rate(2.5, AS_OF) == pytest.approx(expected)
+    assert provider.rate(0.01, AS_OF) == pytest.approx(_zero_rate(points["DGS1MO"]))
+    assert provider.rate(50.0, AS_OF) == pytest.approx(_zero_rate(points["DGS30"]))
+
+
+
+def test_single_pillar_curve_is_flat():
+    curve = YieldCurve.from_treasury_points({"DGS1": 5.0})
+    maturities = np.array([0.01, 1.0, 30.0])
+    np.testing.assert_allclose(curve.rate(maturities), _zero_rate(5.0))
+    assert curve.rate(2.0).shape == ()
+
+def test_points_cached_once_per_day(provider, monkeypatch):
+    loads = []
+    load_points = provider._load_points
+
+    def counting_load(as_of):
+        loads.append(as_of)
+        return load_points(as_of)
+
+    monkeypatch.setattr(provider, "_load_points", counting_load)
+    provider.get_curve(AS_OF)
+    provider.get_curve(AS_OF)
+    assert loads == [AS_OF]
+
+    with open(provider.cache_path, "r") as f:
+        cached = json.load(f)
+    assert cached == {"loaded_on": AS_OF.isoformat(), "points": _fixture_points()}
+
+    # A fresh provider reuses the file for the same day
+    other = YieldCurveProvider(cache_path=provider.cache_path)
+    monkeypatch.setattr(other, "_fetch_fred", pytest.fail)
+    assert other.rate(1.0, AS_OF) == pytest.approx(provider.rate(1.0, AS_OF))
+
+    provider.get_curve(date(2024, 1, 3))
+    assert loads == [AS_OF, date(2024, 1, 3)]
+
+
+def test_failed_load_falls_back_to_stale_cache(provider, monkeypatch):
+    expected = provider.rate(1.0, AS_OF)
+
+    other = YieldCurveProvider(cache_path=provider.cache_path, retry_interval=60.0)
+    calls = []
+
+    def failing_fetch(as_of):
+        calls.append(as_of)
+        raise ConnectionError("FRED is down")
+
+    monkeypatch.setattr(other, "_fetch_fred", failing_fetch)
+    later = date(2024, 1, 10)
+    assert other.rate(1.0, later) == pytest.approx(expected)
+    assert other.rate(1.0, later) == pytest.approx(expected)
+    assert calls == [later]
+
+    other.retry_interval = 0.0
+    other.rate(1.0, later)
+    assert calls == [later, later]
+
+
+def test_failed_load_without_cache_raises(tmp_path, monkeypatch):
+    provider = YieldCurveProvider(cache_path=str(tmp_path / "missing.json"))
+
+    def failing_fetch(as_of):
+        raise OSError("FRED is down")
+
+    monkeypatch.setattr(provider, "_fetch_fred", failing_fetch)
+    with pytest.raises(ValueError):
+        provider.get_curve(AS_OF)
@@ -10,3 +10,4 @@ from .vtk_widget import VTKWidget
 from .spinner_widget import SpinnerWidget
 from .pareto_chart_widget import ParetoChartWidget
 from .environment_toggle import EnvironmentToggle
+from .what_if_panel import WhatIfPanel
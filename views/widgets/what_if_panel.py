@@ -0,0 +1,349 @@
+# views/widgets/what_if_panel.py
+
+from functools import partial
+from PyQt5.QtWidgets import (
+    QApplication,
+    QWidget,
+    QTableView,
+    QVBoxLayout,
+    QGridLayout,
+    QLabel,
+    QSlider,
+    QSizePolicy,
+)
+from PyQt5.QtCore import (
+    Qt,
+    QAbstractTableModel,
+    QModelIndex,
+    QObject,
+    QThread,
+    QTimer,
+    pyqtSignal,
+    pyqtSlot,
+)
+import logging
+import time
+import numpy as np
+from services.black_scholes_service import calculate_greeks_batch
+
+# (column header, result key, display decimals)
+WHAT_IF_COLUMNS = (
+    ("Price", "price", 2),
+    ("Delta", "delta", 3),
+    ("Gamma", "gamma", 4),
+    ("Theta", "theta", 2),
+    ("Vega", "vega", 3),
+    ("P&L", "pnl", 2),
+)
+
+# (label, key, minimum, maximum, scale to scenario units, unit suffix)
+WHAT_IF_SLIDERS = (
+    ("Spot", "spot", -30, 30, 0.01, "%"),
+    ("Vol", "vol", -30, 30, 0.01, " pts"),
+    ("Rate", "rate", -300, 300, 0.0001, " bp"),
+    ("Days forward", "days", 0, 90, 1.0, " d"),
+)
+
+
+def _stop_thread(thread):
+    if thread.isRunning():
+        thread.quit()
+        thread.wait()
+
+
+class WhatIfTableModel(QAbstractTableModel):
+    """
+    Table model over result arrays; cells are formatted on demand so only
+    the visible rows are ever converted to text.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tickers = np.empty(0, dtype=object)
+        self.values = np.empty((0, len(WHAT_IF_COLUMNS)))
+        self._decimals = np.array([column[2] for column in WHAT_IF_COLUMNS])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.tickers)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(WHAT_IF_COLUMNS) + 1
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return "Contract" if section == 0 else WHAT_IF_COLUMNS[section - 1][0]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole and index.column() > 0:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role != Qt.DisplayRole:
+            return None
+        if index.column() == 0:
+            return str(self.tickers[index.row()])
+        column = index.column() - 1
+        return f"{self.values[index.row(), column]:.{self._decimals[column]}f}"
+
+    def reset(self, tickers, values):
+        self.beginResetModel()
+        self.tickers = np.asarray(tickers, dtype=object)
+        self.values = values
+        self.endResetModel()
+
+    def update_values(self, values):
+        """
+        Replace the values and signal only the cells whose displayed text
+        changes, one dataChanged per contiguous run of rows in a column.
+        Cells that were and still are NaN count as unchanged.
+
+        :return: Number of changed cells.
+        """
+        scale = 10.0 ** self._decimals
+        new, old = np.round(values * scale), np.round(self.values * scale)
+        changed = (new != old) & ~(np.isnan(new) & np.isnan(old))
+        self.values = values
+        for column in np.flatnonzero(changed.any(axis=0)):
+            rows = np.flatnonzero(changed[:, column])
+            breaks = np.flatnonzero(np.diff(rows) > 1)
+            starts = np.concatenate([rows[:1], rows[breaks + 1]])
+            stops = np.concatenate([rows[breaks], rows[-1:]])
+            for start, stop in zip(starts.tolist(), stops.tolist()):
+                self.dataChanged.emit(
+                    self.index(start, column + 1),
+                    self.index(stop, column + 1),
+                    [Qt.DisplayRole],
+                )
+        return int(changed.sum())
+
+
+class RepriceWorker(QObject):
+    """
+    Runs the vectorized Greeks kernel off the GUI thread.
+    """
+
+    finished = pyqtSignal(int, object, object, float)
+
+    @pyqtSlot(int, object, object)
+    def reprice(self, generation, inputs, scenario):
+        started = time.perf_counter()
+        S, K, T, r, sigma, is_call, size, base_price = inputs
+        greeks = calculate_greeks_batch(
+            S * (1.0 + scenario["spot"]),
+            K,
+            np.maximum(T - scenario["days"] / 365.0, 0.0),
+            r + scenario["rate"],
+            np.maximum(sigma + scenario["vol"], 1e-4),
+            is_call,
+        )
+        values = np.column_stack(
+            [greeks[key] for _, key, _ in WHAT_IF_COLUMNS[:-1]]
+            + [(greeks["price"] - base_price) * size]
+        )
+        self.finished.emit(
+            generation, scenario, values, time.perf_counter() - started
+        )
+
+
+class WhatIfPanel(QWidget):
+    """
+    Sliders for spot, vol, rate and days forward that live-reprice a set of
+    contracts.
+
+    Slider events are debounced with a single-shot timer and coalesced: at
+    most one reprice is in flight, and any scenario requested meanwhile
+    replaces the pending one. Repricing runs on a worker thread, so the GUI
+    thread only applies results, touching just the cells whose text changed.
+    Each reprice carries the generation of the inputs it was sent with, and
+    results for contracts that have since been replaced are dropped.
+
+    The worker thread is stopped by shutdown(), which also runs on close,
+    when the application is about to quit and when the panel is destroyed.
+    Reprice requests are ignored while the thread is stopped; showing the
+    panel again restarts it and reprices the current scenario.
+    """
+
+    reprice_requested = pyqtSignal(int, object, object)
+
+    def __init__(self, parent=None, debounce_ms=8):
+        """
+        Initialize the WhatIfPanel.
+
+        :param parent: Parent widget.
+        :param debounce_ms: Quiet time after a slider move before repricing.
+        """
+        super().__init__(parent)
+        self.inputs = None
+        # Bumped by set_contracts; results from older inputs are discarded
+        self._generation = 0
+        self.scenario = {key: 0.0 for _, key, *_ in WHAT_IF_SLIDERS}
+        self.sliders = {}
+        self.slider_labels = {}
+        self._busy = False
+        self._pending = None
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self.request_reprice)
+
+        self.worker_thread = QThread(self)
+        self.worker = RepriceWorker()
+        self.worker.moveToThread(self.worker_thread)
+        self.reprice_requested.connect(self.worker.reprice)
+        self.worker.finished.connect(self.on_reprice_finished)
+        self.worker_thread.start()
+        # The thread is a child and is deleted with the panel, so it must be
+        # stopped first however the panel goes away
+        self.destroyed.connect(partial(_stop_thread, self.worker_thread))
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+        self.init_ui()
+        logging.info("WhatIfPanel initialized.")
+
+    def init_ui(self):
+        """
+        Initialize the UI components and layout.
+        """
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        slider_layout = QGridLayout()
+        for row, (label, key, minimum, maximum, _, _) in enumerate(WHAT_IF_SLIDERS):
+            name_label = QLabel(label)
+            name_label.setStyleSheet("color: #ffffff;")
+            slider = QSlider(Qt.Horizontal)
+            slider.setRange(minimum, maximum)
+            slider.setValue(0)
+            slider.valueChanged.connect(self.on_slider_changed)
+            value_label = QLabel()
+            value_label.setStyleSheet("color: #ffffff;")
+            value_label.setMinimumWidth(60)
+            slider_layout.addWidget(name_label, row, 0)
+            slider_layout.addWidget(slider, row, 1)
+            slider_layout.addWidget(value_label, row, 2)
+            self.sliders[key] = slider
+            self.slider_labels[key] = value_label
+        self.update_slider_labels()
+
+        self.model = WhatIfTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.table.setAlternatingRowColors(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setStyleSheet(
+            """
+            QTableView {
+                alternate-background-color: #3a3a3a;
+                background-color: #2c2c2c;
+                color: #ffffff;
+                border: 1px solid #444444;
+            }
+            QHeaderView::section {
+                background-color: #1c1c1c;
+                color: #ffffff;
+                padding: 4px;
+                border: 1px solid #444444;
+            }
+        """
+        )
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: gray;")
+
+        layout.addLayout(slider_layout)
+        layout.addWidget(self.table)
+        layout.addWidget(self.status_label)
+
+    def set_contracts(
+        self, tickers, S, K, T, r, sigma, option_types="call", quantities=1.0
+    ):
+        """
+        Load the contracts to reprice and show them at the current scenario.
+
+        :param tickers: Contract labels.
+        :param T: Time to expiry in years.
+        :param quantities: Position sizes used for the P&L column.
+        """
+        S, K, T, r, sigma, size = (
+            np.asarray(x, dtype=float)
+            for x in np.broadcast_arrays(S, K, T, r, sigma, quantities)
+        )
+        is_call = np.broadcast_to(np.asarray(option_types) == "call", S.shape)
+        base_price = calculate_greeks_batch(S, K, T, r, sigma, is_call)["price"]
+        self.inputs = (S, K, T, r, sigma, is_call, size, base_price)
+        self._generation += 1
+        self.model.reset(tickers, np.zeros((len(S), len(WHAT_IF_COLUMNS))))
+        self.request_reprice()
+
+    def update_slider_labels(self):
+        for _, key, _, _, scale, suffix in WHAT_IF_SLIDERS:
+            value = self.sliders[key].value()
+            self.slider_labels[key].setText(f"{value:+d}{suffix}")
+            self.scenario[key] = value * scale
+
+    def on_slider_changed(self, _value):
+        """
+        Record the new scenario and (re)start the debounce timer.
+        """
+        self.update_slider_labels()
+        self.debounce_timer.start()
+
+    def request_reprice(self):
+        """
+        Send the current scenario to the worker, or park it as the pending
+        scenario if a reprice is already running.
+        """
+        if self.inputs is None or not self.worker_thread.isRunning():
+            return
+        scenario = dict(self.scenario)
+        if self._busy:
+            self._pending = scenario
+            return
+        self._busy = True
+        self.reprice_requested.emit(self._generation, self.inputs, scenario)
+
+    @pyqtSlot(int, object, object, float)
+    def on_reprice_finished(self, generation, scenario, values, seconds):
+        self._busy = False
+        if generation == self._generation:
+            started = time.perf_counter()
+            changed = self.model.update_values(values)
+            self.status_label.setText(
+                f"{len(values)} contracts repriced in {seconds * 1000:.1f} ms, "
+                f"{changed} cells updated in "
+                f"{(time.perf_counter() - started) * 1000:.1f} ms"
+            )
+        if self._pending is not None:
+            # A newer scenario arrived while this one was running
+            pending, self._pending = self._pending, None
+            self._busy = True
+            self.reprice_requested.emit(self._generation, self.inputs, pending)
+
+    def shutdown(self):
+        """
+        Stop the debounce timer and the worker thread. Safe to call more
+        than once.
+        """
+        self.debounce_timer.stop()
+        _stop_thread(self.worker_thread)
+        # Any reprice in flight was abandoned with the thread
+        self._busy = False
+        self._pending = None
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.worker_thread.isRunning():
+            self.worker_thread.start()
+            self.request_reprice()
+
+    def closeEvent(self, event):
+        self.shutdown()
+        super().closeEvent(event)